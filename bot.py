@@ -2,6 +2,8 @@ import os
 import discord
 from discord.ext import commands
 from config import COMMAND_PREFIX, DISCORD_BOT_TOKEN
+from utils.llm_api import llm_client
+from utils.render_pool import render_pool
 
 # Create intents object and enable the message content and reaction intents
 intents = discord.Intents.default()
@@ -9,8 +11,19 @@ intents.message_content = True
 intents.reactions = True
 intents.members = True
 
+class DevrosBot(commands.Bot):
+    async def setup_hook(self):
+        # One pooled HTTP session for every LLM request, for the bot's whole lifetime
+        await llm_client.start()
+        self.llm = llm_client
+
+    async def close(self):
+        await super().close()
+        await llm_client.close()
+        render_pool.shutdown()
+
 # Create bot instance with the correct intents
-bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents)
+bot = DevrosBot(command_prefix=COMMAND_PREFIX, intents=intents)
 
 # Load all cogs (commands) dynamically with debug output
 async def load_cogs():
@@ -40,5 +53,6 @@ async def on_ready():
     )
     await bot.change_presence(activity=activity)
 
-# Start the bot
-bot.run(DISCORD_BOT_TOKEN)
+# Start the bot (guarded: process render workers re-import this file when they spawn)
+if __name__ == "__main__":
+    bot.run(DISCORD_BOT_TOKEN)
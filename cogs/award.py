@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from utils.economy import add_currency, user_key
+from utils.economy import aadd_currency, user_key
 from utils.embed import create_embed
 from config import DEFAULT_CURRENCY_GIVE, BETTING_CHANNEL, CURRENCY_NAME, CURRENCY_SYMBOL
 
@@ -31,7 +31,7 @@ class EconomyAward(commands.Cog):
 
         # ✅ Centralized identity (ID-keyed)
         key = user_key(member)
-        new_balance = add_currency(key, amount)
+        new_balance = await aadd_currency(key, amount)
 
         title = "Currency Awarded!"
         description = (
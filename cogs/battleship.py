@@ -4,7 +4,7 @@ import asyncio
 import re
 
 from utils.embed import create_embed
-from utils.economy import add_currency, remove_currency, load_economy, save_economy, user_key
+from utils.economy import atransact, deposit, withdraw, user_key
 from config import GAME_WIN, GAME_LOSE, BATTLESHIP_CHANNEL, CURRENCY_SYMBOL
 
 
@@ -12,23 +12,6 @@ def _user_key(member: discord.Member) -> str:
     return user_key(member)
 
 
-def increment_battleship_streak(member: discord.Member) -> int:
-    """+1 the member's battleship win streak; returns new streak."""
-    key = _user_key(member)
-    data = load_economy(key)
-    data["battleship_streak"] = data.get("battleship_streak", 0) + 1
-    save_economy(key, data)
-    return data["battleship_streak"]
-
-
-def reset_battleship_streak(member: discord.Member) -> None:
-    """Reset the member's battleship win streak to 0."""
-    key = _user_key(member)
-    data = load_economy(key)
-    data["battleship_streak"] = 0
-    save_economy(key, data)
-
-
 # --- Constants & Helper Functions ---
 
 EMPTY_CELL = ":white_large_square:"       # Open ocean
@@ -549,11 +532,14 @@ class Battleship(commands.Cog):
             if winner:
                 loser = game.player1 if winner == game.player2 else game.player2
 
-                add_currency(_user_key(winner), GAME_WIN)
-                remove_currency(_user_key(loser), GAME_LOSE)
+                # Payouts and streak changes for both players in one transaction
+                def settle(winner_data, loser_data):
+                    deposit(winner_data, GAME_WIN)
+                    withdraw(loser_data, GAME_LOSE, clamp=True)
+                    winner_data["battleship_streak"] = winner_data.get("battleship_streak", 0) + 1
+                    loser_data["battleship_streak"] = 0
 
-                increment_battleship_streak(winner)
-                reset_battleship_streak(loser)
+                await atransact((_user_key(winner), _user_key(loser)), settle)
 
                 channel = self.bot.get_channel(BATTLESHIP_CHANNEL)
                 await channel.send(
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 
-from utils.economy import load_economy, save_economy, add_currency, remove_currency, user_key
+from utils.economy import atransact, deposit, withdraw, InsufficientFunds, user_key
 from utils.embed import create_embed
 from config import BETTING_CHANNEL, CURRENCY_NAME, CURRENCY_SYMBOL
 
@@ -19,18 +19,6 @@ class BetCog(commands.Cog):
                 return chr(0x1F1E6 + (ord(ch) - ord("A")))
         return "🅰️"
 
-    async def manage_bet_lock(self, member: discord.abc.User, lock_status: int):
-        # ID-keyed economy: pass the key into economy functions
-        key = user_key(member)
-        data = load_economy(key)
-        data["bet_lock"] = lock_status
-        save_economy(key, data)
-
-    async def can_place_bet(self, member: discord.abc.User) -> bool:
-        key = user_key(member)
-        data = load_economy(key)
-        return data.get("bet_lock", 0) == 0
-
     async def initiate_bet(
         self,
         ctx: commands.Context,
@@ -38,16 +26,6 @@ class BetCog(commands.Cog):
         user_bet_against: discord.abc.User,
         bet_explanation: str | None = None
     ):
-        if not await self.can_place_bet(ctx.author):
-            await ctx.send(
-                f"{ctx.author.mention}, you are locked from placing bets. Resolve your previous bet first."
-            )
-            return
-        if not await self.can_place_bet(user_bet_against):
-            await ctx.send(
-                f"{user_bet_against.mention} is locked from placing bets. They need to resolve their previous bet first."
-            )
-            return
         if amount <= 0:
             await ctx.send("You must bet a positive amount!")
             return
@@ -55,11 +33,37 @@ class BetCog(commands.Cog):
         challenger_key = user_key(ctx.author)
         opponent_key = user_key(user_bet_against)
 
-        remove_currency(challenger_key, amount)
-        remove_currency(opponent_key, amount)
+        # Lock check, both stakes and both bet locks are applied in one transaction
+        def place_stakes(challenger, opponent):
+            if challenger.get("bet_lock", 0):
+                return "challenger_locked"
+            if opponent.get("bet_lock", 0):
+                return "opponent_locked"
+            withdraw(challenger, amount)
+            withdraw(opponent, amount)
+            challenger["bet_lock"] = 1
+            opponent["bet_lock"] = 1
+            return None
+
+        try:
+            locked = await atransact((challenger_key, opponent_key), place_stakes)
+        except InsufficientFunds:
+            await ctx.send(
+                f"Both {ctx.author.mention} and {user_bet_against.mention} need at least "
+                f"{CURRENCY_SYMBOL}{amount} {CURRENCY_NAME} to place this bet."
+            )
+            return
 
-        await self.manage_bet_lock(ctx.author, 1)
-        await self.manage_bet_lock(user_bet_against, 1)
+        if locked == "challenger_locked":
+            await ctx.send(
+                f"{ctx.author.mention}, you are locked from placing bets. Resolve your previous bet first."
+            )
+            return
+        if locked == "opponent_locked":
+            await ctx.send(
+                f"{user_bet_against.mention} is locked from placing bets. They need to resolve their previous bet first."
+            )
+            return
 
         bet_message = (
             f"{ctx.author.mention} has challenged {user_bet_against.mention} to a bet of "
@@ -101,13 +105,13 @@ class BetCog(commands.Cog):
         amount: int,
         bet_explanation: str | None = None
     ):
-        winner_key = user_key(winner)
-
-        # Winner gets the full pot (both stakes) = 2 * amount
-        add_currency(winner_key, 2 * amount)
+        # Winner gets the full pot (both stakes) = 2 * amount; both bet locks are released
+        def pay_out(winner_data, loser_data):
+            deposit(winner_data, 2 * amount)
+            winner_data["bet_lock"] = 0
+            loser_data["bet_lock"] = 0
 
-        await self.manage_bet_lock(winner, 0)
-        await self.manage_bet_lock(loser, 0)
+        await atransact((user_key(winner), user_key(loser)), pay_out)
 
         resolution_description = (
             f"{winner.mention} wins the bet! {CURRENCY_SYMBOL}{2 * amount} {CURRENCY_NAME} has been transferred to them!\n"
@@ -214,11 +218,12 @@ class BetCog(commands.Cog):
 
                     await channel.send(embed=refund_embed)
 
-                    add_currency(user_key(challenger), amount)
-                    add_currency(user_key(opponent), amount)
+                    def refund(challenger_data, opponent_data):
+                        for data in (challenger_data, opponent_data):
+                            deposit(data, amount)
+                            data["bet_lock"] = 0
 
-                    await self.manage_bet_lock(challenger, 0)
-                    await self.manage_bet_lock(opponent, 0)
+                    await atransact((user_key(challenger), user_key(opponent)), refund)
 
                     await reaction.message.delete()
                     del self.active_bets[message_id]
@@ -20,6 +20,17 @@ class ConfigManager(commands.Cog):
             'XP_PER_MESSAGE': int,
             'XP_PER_REACTION': int,
             'XP_PER_COMMAND': int,
+            'COMMAND_MESSAGES_EARN_MESSAGE_XP': bool,
+            'XP_RATE_MESSAGE_BURST': int,
+            'XP_RATE_MESSAGE_REFILL': int,
+            'XP_RATE_COMMAND_BURST': int,
+            'XP_RATE_COMMAND_REFILL': int,
+            'XP_RATE_REACTION_BURST': int,
+            'XP_RATE_REACTION_REFILL': int,
+            'XP_REPEAT_WINDOW': int,
+            'XP_PER_VOICE_MINUTE': int,
+            'VOICE_XP_MIN_MEMBERS': int,
+            'VOICE_XP_ALLOW_MUTED': bool,
             'LEVEL_UP_REWARD_MULTIPLIER': int,
             'DEFAULT_CURRENCY_GIVE': int,
             'DEFAULT_CURRENCY_TAKE': int,
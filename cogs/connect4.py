@@ -1,12 +1,11 @@
 import discord
 import asyncio
-import os
-import json
 from discord.ext import commands
 
-from utils.economy import add_currency, remove_currency, load_economy, save_economy, user_key
+from utils.economy import atransact, deposit, withdraw, user_key
+from utils.leaderboard_index import atop
 from utils.embed import create_embed
-from config import GAME_WIN, GAME_LOSE, CURRENCY_NAME, CONNECT4_CHANNEL, ECONOMY_FOLDER
+from config import GAME_WIN, GAME_LOSE, CURRENCY_NAME, CONNECT4_CHANNEL
 
 # Emoji definitions (using Unicode number emojis for columns 1-7)
 number_emojis = ["\u0031\u20E3", "\u0032\u20E3", "\u0033\u20E3", "\u0034\u20E3", "\u0035\u20E3", "\u0036\u20E3", "\u0037\u20E3"]
@@ -163,23 +162,21 @@ class Connect4(commands.Cog):
             winner_key = user_key(winner.member)
             loser_key = user_key(loser.member)
 
-            add_currency(winner_key, GAME_WIN)
-            remove_currency(loser_key, GAME_LOSE)
+            # Payouts plus streak update for winner and reset for loser, in one transaction
+            def settle(winner_data, loser_data):
+                deposit(winner_data, GAME_WIN)
+                withdraw(loser_data, GAME_LOSE, clamp=True)
+                winner_data["connect4_streak"] = winner_data.get("connect4_streak", 0) + 1
+                loser_data["connect4_streak"] = 0
+                return winner_data["connect4_streak"]
 
-            # Update Connect4 streak for winner and reset for loser
-            winner_data = load_economy(winner_key)
-            winner_data["connect4_streak"] = winner_data.get("connect4_streak", 0) + 1
-            save_economy(winner_key, winner_data)
-
-            loser_data = load_economy(loser_key)
-            loser_data["connect4_streak"] = 0
-            save_economy(loser_key, loser_data)
+            winner_streak = await atransact((winner_key, loser_key), settle)
 
             result_embed = await create_embed(
                 "Game Over",
                 f"{winner.member.mention} wins!\nYou have been awarded {GAME_WIN} {CURRENCY_NAME}.\n"
                 f"{loser.member.mention} loses {GAME_LOSE} {CURRENCY_NAME}.\n"
-                f"{winner.member.mention} now has a Connect4 win streak of {winner_data['connect4_streak']}.",
+                f"{winner.member.mention} now has a Connect4 win streak of {winner_streak}.",
                 color=discord.Color.green()
             )
             await channel.send(embed=result_embed)
@@ -192,29 +189,10 @@ class Connect4(commands.Cog):
         # Delete the command message to keep channels clean
         await ctx.message.delete()
 
-        leaderboard = []
-
-        # Iterate over all economy files (now ID-keyed)
-        for filename in os.listdir(ECONOMY_FOLDER):
-            if not filename.endswith(".json"):
-                continue
-
-            user_id_str = filename[:-5]  # strip .json
-            if not user_id_str.isdigit():
-                continue
-
-            filepath = os.path.join(ECONOMY_FOLDER, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception:
-                continue
-
-            streak = int(data.get("connect4_streak", 0) or 0)
-            leaderboard.append((int(user_id_str), streak))
-
-        leaderboard.sort(key=lambda x: x[1], reverse=True)
-        top10 = leaderboard[:10]
+        top10 = [
+            (int(user_id_str), summary["connect4_streak"])
+            for user_id_str, summary in await atop("connect4", 10)
+        ]
 
         description = ""
         for idx, (user_id, streak) in enumerate(top10, start=1):
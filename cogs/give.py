@@ -1,6 +1,6 @@
 import discord
 from discord.ext import commands
-from utils.economy import add_currency, remove_currency, get_balance, user_key
+from utils.economy import atransact, deposit, withdraw, InsufficientFunds, user_key
 from utils.embed import create_embed
 from config import DEFAULT_CURRENCY_GIVE, BETTING_CHANNEL, CURRENCY_NAME, CURRENCY_SYMBOL
 
@@ -23,20 +23,18 @@ class EconomyGive(commands.Cog):
         sender_key = user_key(ctx.author)
         receiver_key = user_key(member)
 
-        # Get the balance of the user issuing the command (ID-keyed)
-        user_balance = get_balance(sender_key)
+        # Balance check, debit and credit happen in one locked transaction (ID-keyed)
+        def transfer(sender, receiver):
+            withdraw(sender, amount)
+            deposit(receiver, amount)
+            return sender["currency"], receiver["currency"]
 
-        # Ensure the user has enough currency
-        if user_balance < amount:
+        try:
+            new_balance_sender, new_balance_receiver = await atransact((sender_key, receiver_key), transfer)
+        except InsufficientFunds:
             await ctx.send(f"You do not have enough {CURRENCY_NAME} to give that amount.")
             return
 
-        # Remove currency from the giver's balance
-        new_balance_sender = remove_currency(sender_key, amount)
-
-        # Add currency to the receiver's balance
-        new_balance_receiver = add_currency(receiver_key, amount)
-
         # Build the embed message for the transaction
         title = "Currency Given!"
         description = (
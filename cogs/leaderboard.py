@@ -1,80 +1,242 @@
-import os
-import json
+import math
+import asyncio
 import discord
 from discord.ext import commands
-from config import ECONOMY_FOLDER, CURRENCY_SYMBOL
+from config import CURRENCY_SYMBOL
+from utils.economy import user_key
+from utils.leaderboard_index import aensure_built, aranks, atop, ranking
+from utils.period_stats import PERIODS, period_stats, atop as aperiod_top
 from utils.embed import create_embed
+from utils.xp import pending_xp
+from utils.xp_curve import curve
+
+PAGE_SIZE = 10
+
+# Board -> label shown by !rank
+RANK_LABELS = {
+    "level": "Level & XP",
+    "currency": "Currency",
+    "wordle": "Wordle streak",
+    "connect4": "Connect4 streak",
+    "battleship": "Battleship streak",
+}
+
+PERIOD_TITLES = {
+    "day": "Today",
+    "week": "This Week",
+    "month": "This Month",
+}
+
+def _page_count(period: str = "all", field: str = "xp") -> int:
+    total = len(ranking) if period == "all" else period_stats.count(period, field)
+    return max(1, math.ceil(total / PAGE_SIZE))
+
+def _member_label(guild: discord.Guild, user_id: int) -> str:
+    member = guild.get_member(user_id)
+    if member:
+        return f"{member.mention} ({member.display_name})"
+    return f"`{user_id}` (Unknown Member)"
+
+async def build_period_embed(guild: discord.Guild, page: int, period: str, field: str) -> discord.Embed:
+    """Embed for one page of XP earned / currency gained during `period` (UTC days)."""
+    pages = _page_count(period, field)
+    offset = (page - 1) * PAGE_SIZE
+
+    lines = []
+    for i, (user_id_str, xp, bal) in enumerate(await aperiod_top(period, field, PAGE_SIZE, offset), start=offset + 1):
+        lines.append(
+            f"**{i}.** {_member_label(guild, int(user_id_str))} — "
+            f"+{xp} XP — {CURRENCY_SYMBOL}{bal:+}"
+        )
+
+    ranked_by = "XP" if field == "xp" else "Currency"
+    embed = await create_embed(
+        title=f"Leaderboard: {PERIOD_TITLES[period]} ({ranked_by})",
+        description="\n".join(lines) or "No activity in this period yet.",
+        color=discord.Color.purple()
+    )
+    embed.set_author(name=f"Page {page}/{pages}")
+    return embed
+
+async def build_leaderboard_embed(guild: discord.Guild, page: int, period: str = "all", field: str = "xp") -> discord.Embed:
+    """Embed for one (1-based) page of the all-time level/XP leaderboard or a period board."""
+    if period != "all":
+        return await build_period_embed(guild, page, period, field)
+
+    pages = _page_count()
+    offset = (page - 1) * PAGE_SIZE
+
+    # Ordered by level, then XP (maintained incrementally on economy writes)
+    rows = [
+        (int(user_id_str), summary["level"], summary["xp"] + pending_xp(user_id_str), summary["currency"])
+        for user_id_str, summary in await atop("level", PAGE_SIZE, offset)
+    ]
+
+    leaderboard_text = ""
+
+    for i, (user_id, lvl, xp, bal) in enumerate(rows, start=offset + 1):
+        member = guild.get_member(user_id)
+
+        if member:
+            mention = member.mention
+            display = member.display_name
+        else:
+            mention = f"`{user_id}`"
+            display = "Unknown Member"
+
+        leaderboard_text += (
+            f"**{i}.** {mention} ({display}) — "
+            f"Level {lvl} ({xp}/{curve.cost(lvl)} XP) — {CURRENCY_SYMBOL}{bal}\n"
+        )
+
+    if not leaderboard_text:
+        leaderboard_text = "No leaderboard data available yet."
+
+    embed = await create_embed(
+        title="Leaderboard: Top Levels & Currency",
+        description=leaderboard_text,
+        color=discord.Color.purple()
+    )
+    embed.set_author(name=f"Page {page}/{pages}")
+    return embed
+
+
+class LeaderboardView(discord.ui.View):
+    """Previous/Next buttons for !leaderboard (only the member who asked can turn pages)."""
+
+    def __init__(self, author: discord.abc.User, guild: discord.Guild, page: int, period: str = "all", field: str = "xp"):
+        super().__init__(timeout=120)
+        self.author = author
+        self.guild = guild
+        self.page = page
+        self.period = period
+        self.field = field
+        self.message = None
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        pages = _page_count(self.period, self.field)
+        self.page = min(self.page, pages)
+        self.previous_page.disabled = self.page <= 1
+        self.next_page.disabled = self.page >= pages
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author.id:
+            await interaction.response.send_message(
+                "Run `!leaderboard` yourself to browse pages.", ephemeral=True
+            )
+            return False
+        return True
+
+    async def _show(self, interaction: discord.Interaction):
+        self._sync_buttons()
+        embed = await build_leaderboard_embed(self.guild, self.page, self.period, self.field)
+        await interaction.response.edit_message(embed=embed, view=self)
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, emoji="◀️")
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = max(1, self.page - 1)
+        await self._show(interaction)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="▶️")
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await self._show(interaction)
+
+    async def on_timeout(self):
+        for child in self.children:
+            child.disabled = True
+        if self.message:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
+
 
 class Leaderboard(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self._warmup = None
+
+    async def cog_load(self):
+        # Build the index in the background so the first !leaderboard / !rank doesn't pay for the scan
+        self._warmup = asyncio.create_task(self._build_index())
+
+    async def cog_unload(self):
+        if self._warmup is not None:
+            self._warmup.cancel()
+
+    async def _build_index(self):
+        try:
+            await aensure_built()
+            print(f"[Leaderboard] Ranking index ready ({len(ranking)} members)")
+        except Exception as e:
+            print(f"[Leaderboard] Failed to build ranking index: {e}")
 
     @commands.command(
         name="leaderboard",
-        help="Show top 10 users by level and XP, including currency"
+        help="Show users ranked by level and XP, or by what they earned today/this week/this month. "
+             "Usage: !leaderboard [day|week|month] [xp|currency] [page]"
     )
-    async def leaderboard(self, ctx):
-        users = []
+    async def leaderboard(self, ctx, *args: str):
+        period, field, page = "all", "xp", 1
+        for arg in (a.lower() for a in args):
+            if arg in PERIODS or arg == "all":
+                period = arg
+            elif arg in ("xp", "currency"):
+                field = arg
+            elif arg.isdigit():
+                page = int(arg)
+            else:
+                await ctx.send("Usage: `!leaderboard [day|week|month] [xp|currency] [page]`")
+                return
 
-        # Economy files are now ID-keyed: <user_id>.json
-        for filename in os.listdir(ECONOMY_FOLDER):
-            if not filename.endswith(".json"):
-                continue
+        if period == "all":
+            await aensure_built()
+        page = min(max(1, page), _page_count(period, field))
 
-            user_id_str = filename[:-5]  # strip ".json"
-            if not user_id_str.isdigit():
-                continue
+        view = LeaderboardView(ctx.author, ctx.guild, page, period, field)
+        embed = await build_leaderboard_embed(ctx.guild, page, period, field)
+        view.message = await ctx.send(embed=embed, view=view)
 
-            path = os.path.join(ECONOMY_FOLDER, filename)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception:
-                continue
-
-            users.append((
-                int(user_id_str),                # user_id
-                data.get("level", 1),
-                data.get("xp", 0),
-                data.get("currency", 0)
-            ))
-
-        # Sort by level first, then XP (descending)
-        users.sort(key=lambda x: (x[1], x[2]), reverse=True)
-        top10 = users[:10]
-
-        leaderboard_text = ""
-
-        for i, (user_id, lvl, xp, bal) in enumerate(top10, start=1):
-            member = ctx.guild.get_member(user_id)
-
-            if member:
-                mention = member.mention
-                display = member.display_name
-            else:
-                mention = f"`{user_id}`"
-                display = "Unknown Member"
-
-            leaderboard_text += (
-                f"**{i}.** {mention} ({display}) — "
-                f"Level {lvl} ({xp} XP) — {CURRENCY_SYMBOL}{bal}\n"
-            )
+        try:
+            await ctx.message.delete()
+        except discord.Forbidden:
+            pass
 
-        if not leaderboard_text:
-            leaderboard_text = "No leaderboard data available yet."
+    @commands.command(
+        name="rank",
+        help="Show your (or another user’s) position on every leaderboard. Usage: !rank [@member]"
+    )
+    async def rank(self, ctx, member: discord.Member | None = None):
+        member = member or ctx.author
+        ranks = await aranks(user_key(member))
+        total = len(ranking)
+
+        if all(r is None for r in ranks.values()):
+            await ctx.send(f"{member.display_name} is not on the leaderboards yet.")
+            return
+
+        summary = ranking.summary(user_key(member))
+        values = {
+            "level": f"Level {summary['level']} ({summary['xp'] + pending_xp(user_key(member))} XP)",
+            "currency": f"{CURRENCY_SYMBOL}{summary['currency']}",
+            "wordle": f"`{summary['wordle_streak']}`",
+            "connect4": f"`{summary['connect4_streak']}`",
+            "battleship": f"`{summary['battleship_streak']}`",
+        }
+
+        lines = [
+            f"**{label}:** #{ranks[board]} of {total} — {values[board]}"
+            for board, label in RANK_LABELS.items()
+        ]
 
         embed = await create_embed(
-            title="Leaderboard: Top Levels & Currency",
-            description=leaderboard_text,
+            title=f"Rankings for {member.display_name}",
+            description="\n".join(lines),
             color=discord.Color.purple()
         )
-
         await ctx.send(embed=embed)
 
-        try:
-            await ctx.message.delete()
-        except discord.Forbidden:
-            pass
-
 async def setup(bot):
     await bot.add_cog(Leaderboard(bot))
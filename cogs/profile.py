@@ -1,8 +1,9 @@
 # cogs/profile.py
+from io import BytesIO
 import discord
 from discord.ext import commands
-from config import CURRENCY_NAME, CURRENCY_SYMBOL
-from utils.economy import load_economy, user_key
+from config import CURRENCY_NAME, CURRENCY_SYMBOL, MODERATOR_ROLE_ID
+from utils.economy import aload, run_io, user_key
 from utils.embed import create_embed
 from utils.shop import (
     ensure_shop_schema,
@@ -10,7 +11,13 @@ from utils.shop import (
     get_owned_frames,
     get_owned_colors,
 )
-from utils.profile_card import render_profile_thumbnail
+from utils.profile_card import CardStats, render_key, render_profile_card, render_profile_thumbnail
+from utils.render_cache import render_cache
+from utils.image_encoder import encoder_stats
+from utils.render_pool import RenderQueueFull, render_pool
+from utils.avatar_cache import avatar_cache
+from utils.xp import pending_xp
+from utils.xp_curve import curve
 
 def _discord_color_from_hex(value: str | None) -> discord.Color:
     if not value:
@@ -36,20 +43,20 @@ class Balance(commands.Cog):
         member = member or ctx.author
 
         key = user_key(member)
-        data = load_economy(key)
+        data = await aload(key)
 
         # Ensure inventory exists for anyone viewed
-        ensure_shop_schema(member)
+        await run_io(ensure_shop_schema, member)
 
         # Use equipped values only to render visuals (do NOT display them in text)
-        frame_id, accent_hex = get_equipped(member)
+        frame_id, accent_hex = await run_io(get_equipped, member)
 
-        owned_frames = get_owned_frames(member)
-        owned_colors = get_owned_colors(member)
+        owned_frames = await run_io(get_owned_frames, member)
+        owned_colors = await run_io(get_owned_colors, member)
 
         lvl = int(data.get("level", 1) or 1)
-        xp = int(data.get("xp", 0) or 0)
-        needed = 100 * lvl
+        xp = int(data.get("xp", 0) or 0) + pending_xp(key)  # include XP not yet written
+        needed = curve.cost(lvl)
         bal = int(data.get("currency", 0) or 0)
 
         frames_text = ", ".join(f"`{f}`" for f in owned_frames) if owned_frames else "`none`"
@@ -76,22 +83,115 @@ class Balance(commands.Cog):
             color=_discord_color_from_hex(accent_hex),
         )
 
-        # Render framed thumbnail (top-left)
-        thumb_bytes = await render_profile_thumbnail(
-            member,
-            frame_id=frame_id,
-            accent_hex=accent_hex,
-            size=256,
-        )
-        thumb_file = discord.File(fp=thumb_bytes, filename="thumb.png")
-        embed.set_thumbnail(url="attachment://thumb.png")
+        # Same avatar/frame/color as an earlier view: point at that upload instead of re-sending it
+        thumb_key = render_key(member, "thumb", frame_id, accent_hex, 256)
+        thumb_url = render_cache.url(thumb_key)
+        if thumb_url:
+            embed.set_thumbnail(url=thumb_url)
+            await ctx.send(embed=embed)
+        else:
+            # Render framed thumbnail (top-left); under heavy load send the text-only profile
+            try:
+                thumb = await render_profile_thumbnail(
+                    member,
+                    frame_id=frame_id,
+                    accent_hex=accent_hex,
+                    size=256,
+                )
+            except RenderQueueFull:
+                await ctx.send(embed=embed)
+            else:
+                filename = f"thumb.{thumb.extension}"
+                thumb_file = discord.File(fp=BytesIO(thumb.data), filename=filename)
+                embed.set_thumbnail(url=f"attachment://{filename}")
 
-        await ctx.send(embed=embed, file=thumb_file)
+                sent = await ctx.send(embed=embed, file=thumb_file)
+                render_cache.remember_upload(thumb_key, sent)
 
         try:
             await ctx.message.delete()
         except (discord.NotFound, discord.Forbidden):
             pass
 
+    @commands.command(
+        name="card",
+        help="Show your (or another user’s) profile as an image card: level, XP bar, balance, streaks."
+    )
+    async def card(self, ctx, member: discord.Member | None = None):
+        member = member or ctx.author
+
+        key = user_key(member)
+        data = await aload(key)
+        await run_io(ensure_shop_schema, member)
+        frame_id, accent_hex = await run_io(get_equipped, member)
+
+        lvl = int(data.get("level", 1) or 1)
+        stats = CardStats(
+            name=member.display_name,
+            level=lvl,
+            xp=int(data.get("xp", 0) or 0) + pending_xp(key),
+            needed=curve.cost(lvl),
+            currency=CURRENCY_NAME,
+            balance=int(data.get("currency", 0) or 0),
+            wordle_streak=int(data.get("wordle_streak", 0) or 0),
+            connect4_streak=int(data.get("connect4_streak", 0) or 0),
+            battleship_streak=int(data.get("battleship_streak", 0) or 0),
+        )
+
+        try:
+            card = await render_profile_card(member, frame_id=frame_id, accent_hex=accent_hex, stats=stats)
+        except RenderQueueFull:
+            await ctx.send("Too many cards are being drawn right now, try again in a moment (or use `!profile`).")
+            return
+
+        await ctx.send(file=discord.File(fp=BytesIO(card.data), filename=f"card.{card.extension}"))
+
+    # An attachment URL stops working once its message is gone: never reuse it after that
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        render_cache.forget_message(payload.message_id)
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        for message_id in payload.message_ids:
+            render_cache.forget_message(message_id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        render_cache.forget_channel(channel.id)
+
+    @commands.command(
+        name="renderstats",
+        help="Show profile render pool latency / queue depth, avatar / render cache counters and encoder sizes/times (moderators)."
+    )
+    @commands.has_role(MODERATOR_ROLE_ID)
+    async def renderstats(self, ctx):
+        render = render_pool.stats()
+        avatars = avatar_cache.stats()
+        renders = render_cache.stats()
+
+        description = (
+            f"**Render pool** ({render['mode']}, {render['workers']} workers)\n"
+            f"Running: `{render['running']}` — Queued: `{render['queue_depth']}`\n"
+            f"Completed: `{render['completed']}` — Failed: `{render['failed']}` — Refused: `{render['rejected']}`\n"
+            f"Latency p50 / p95: `{render['p50_ms']} ms` / `{render['p95_ms']} ms`\n\n"
+            f"**Avatar cache**\n"
+            f"Memory hits: `{avatars['hits']}` — Disk hits: `{avatars['disk_hits']}` — Downloads: `{avatars['misses']}`\n"
+            f"Cached: `{avatars['entries']}` avatars, `{avatars['memory_bytes'] // 1024} KiB`\n\n"
+            f"**Render cache**\n"
+            f"Hits: `{renders['hits']}` — Reused uploads: `{renders['url_hits']}` — Misses: `{renders['misses']}`\n"
+            f"Cached: `{renders['entries']}` images, `{renders['memory_bytes'] // 1024} KiB`"
+        )
+
+        encoders = encoder_stats.summary()
+        if encoders:
+            description += "\n\n**Encoders**\n" + "\n".join(
+                f"`{name}`: {e['count']} images — avg `{e['avg_kb']} KiB` in `{e['avg_ms']} ms`"
+                for name, e in encoders.items()
+            )
+
+        embed = await create_embed(title="Profile Rendering", description=description)
+        await ctx.send(embed=embed)
+
 async def setup(bot):
     await bot.add_cog(Balance(bot))
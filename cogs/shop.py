@@ -1,13 +1,12 @@
-import os
 import discord
 from discord.ext import commands
 
 from utils.embed import create_embed
-from utils.economy import get_balance, remove_currency
+from utils.frame_assets import frame_assets
+from utils.economy import aget_balance, run_io, InsufficientFunds
 from utils.shop import (
     ensure_shop_schema,
-    grant_frame,
-    grant_color,
+    purchase,
     equip_frame,
     equip_color,
     owns_frame,
@@ -18,8 +17,6 @@ from utils.shop import (
     normalize_hex_color,
 )
 
-# Folder that holds frame PNG files
-PROFILE_FRAMES_DIR = os.path.join("data", "profile_frames")
 
 # ============================================================
 # HARD-CODED SHOP CATALOG
@@ -55,8 +52,8 @@ SHOP_COLORS = {
 # ============================================================
 
 def _frame_exists(frame_id: str) -> bool:
-    """Check that the PNG file actually exists on disk."""
-    return os.path.exists(os.path.join(PROFILE_FRAMES_DIR, f"{frame_id}.png"))
+    """Check that the PNG file actually exists (cached folder listing, see utils.frame_assets)."""
+    return frame_assets.exists(frame_id)
 
 
 class Shop(commands.Cog):
@@ -69,7 +66,7 @@ class Shop(commands.Cog):
     @commands.command(name="shop")
     async def shop(self, ctx):
         """Show available shop items."""
-        ensure_shop_schema(ctx.author)
+        await run_io(ensure_shop_schema, ctx.author)
 
         frame_lines = []
         for frame_id, meta in SHOP_FRAMES.items():
@@ -109,7 +106,7 @@ class Shop(commands.Cog):
     @commands.command(name="buy")
     async def buy(self, ctx, category: str, *, item: str):
         """Buy a shop item."""
-        ensure_shop_schema(ctx.author)
+        await run_io(ensure_shop_schema, ctx.author)
 
         category = category.lower().strip()
         item = item.strip()
@@ -130,19 +127,21 @@ class Shop(commands.Cog):
                 await ctx.send("Frame PNG file is missing on the server.")
                 return
 
-            if owns_frame(ctx.author, frame_id):
+            if await run_io(owns_frame, ctx.author, frame_id):
                 await ctx.send("You already own this frame.")
                 return
 
             price = SHOP_FRAMES[frame_id]["price"]
-            bal = get_balance(ctx.author)
-
-            if bal < price:
+            try:
+                bought = await run_io(purchase, ctx.author, "frames", frame_id, price)
+            except InsufficientFunds:
+                bal = await aget_balance(ctx.author)
                 await ctx.send(f"You need `{price}` gold, but only have `{bal}`.")
                 return
 
-            remove_currency(ctx.author, price)
-            grant_frame(ctx.author, frame_id)
+            if bought is None:
+                await ctx.send("You already own this frame.")
+                return
 
             embed = await create_embed(
                 "Purchase Complete",
@@ -158,19 +157,21 @@ class Shop(commands.Cog):
             await ctx.send("That color is not sold in the shop.")
             return
 
-        if owns_color(ctx.author, color_hex):
+        if await run_io(owns_color, ctx.author, color_hex):
             await ctx.send("You already own this color.")
             return
 
         price = SHOP_COLORS[color_hex]["price"]
-        bal = get_balance(ctx.author)
-
-        if bal < price:
+        try:
+            bought = await run_io(purchase, ctx.author, "colors", color_hex, price)
+        except InsufficientFunds:
+            bal = await aget_balance(ctx.author)
             await ctx.send(f"You need `{price}` gold, but only have `{bal}`.")
             return
 
-        remove_currency(ctx.author, price)
-        grant_color(ctx.author, color_hex)
+        if bought is None:
+            await ctx.send("You already own this color.")
+            return
 
         embed = await create_embed(
             "Purchase Complete",
@@ -185,7 +186,7 @@ class Shop(commands.Cog):
     @commands.command(name="equip")
     async def equip(self, ctx, category: str, *, item: str):
         """Equip an owned cosmetic."""
-        ensure_shop_schema(ctx.author)
+        await run_io(ensure_shop_schema, ctx.author)
 
         category = category.lower().strip()
         item = item.strip()
@@ -196,30 +197,30 @@ class Shop(commands.Cog):
 
         if category == "frame":
             if item.lower() == "none":
-                equip_frame(ctx.author, None)
+                await run_io(equip_frame, ctx.author, None)
                 await ctx.send("Frame unequipped.")
                 return
 
-            if not owns_frame(ctx.author, item.lower()):
+            if not await run_io(owns_frame, ctx.author, item.lower()):
                 await ctx.send("You don’t own that frame.")
                 return
 
-            equip_frame(ctx.author, item.lower())
+            await run_io(equip_frame, ctx.author, item.lower())
             await ctx.send(f"Equipped frame `{item.lower()}`.")
             return
 
         # color
         if item.lower() == "none":
-            equip_color(ctx.author, None)
+            await run_io(equip_color, ctx.author, None)
             await ctx.send("Accent color reset to default.")
             return
 
         color_hex = normalize_hex_color(item)
-        if not color_hex or not owns_color(ctx.author, color_hex):
+        if not color_hex or not await run_io(owns_color, ctx.author, color_hex):
             await ctx.send("You don’t own that color.")
             return
 
-        equip_color(ctx.author, color_hex)
+        await run_io(equip_color, ctx.author, color_hex)
         await ctx.send(f"Equipped color `{color_hex}`.")
 
     # ----------------------------
@@ -229,11 +230,11 @@ class Shop(commands.Cog):
     async def inventory(self, ctx, member: discord.Member | None = None):
         """Show a user's owned cosmetics (public)."""
         member = member or ctx.author
-        ensure_shop_schema(member)
+        await run_io(ensure_shop_schema, member)
 
-        frames = get_owned_frames(member)
-        colors = get_owned_colors(member)
-        frame_eq, color_eq = get_equipped(member)
+        frames = await run_io(get_owned_frames, member)
+        colors = await run_io(get_owned_colors, member)
+        frame_eq, color_eq = await run_io(get_equipped, member)
 
         desc = (
             f"{member.mention}\n\n"
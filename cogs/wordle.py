@@ -1,12 +1,12 @@
 import discord
 from discord.ext import commands
 import os
-import json
 import random
-from config import GAME_WIN, GAME_LOSE, ECONOMY_FOLDER, WORDLE_CHANNEL, CURRENCY_NAME
+from config import GAME_WIN, GAME_LOSE, WORDLE_CHANNEL, CURRENCY_NAME
 from utils import economy
 from utils.embed import create_embed
 from utils.economy import user_key
+from utils.leaderboard_index import atop
 
 MAX_ATTEMPTS = 6
 WORDLE_WORDS_FILE = os.path.join("data", "wordle_words.txt")
@@ -94,10 +94,11 @@ class Wordle(commands.Cog):
         description = build_game_description(game)
 
         if guess_word == answer:
-            econ = economy.load_economy(key)
-            econ["wordle_streak"] = econ.get("wordle_streak", 0) + 1
-            economy.save_economy(key, econ)
-            economy.add_currency(key, GAME_WIN)
+            def record_win(econ):
+                econ["wordle_streak"] = econ.get("wordle_streak", 0) + 1
+                economy.deposit(econ, GAME_WIN)
+
+            await economy.atransact((key,), record_win)
 
             description += (
                 f"\n\nCongratulations {ctx.author.mention}! "
@@ -106,10 +107,11 @@ class Wordle(commands.Cog):
             del active_games[key]
 
         elif game["attempts"] >= MAX_ATTEMPTS:
-            econ = economy.load_economy(key)
-            econ["wordle_streak"] = 0
-            economy.save_economy(key, econ)
-            economy.remove_currency(key, GAME_LOSE)
+            def record_loss(econ):
+                econ["wordle_streak"] = 0
+                economy.withdraw(econ, GAME_LOSE, clamp=True)
+
+            await economy.atransact((key,), record_loss)
 
             description += (
                 f"\n\nGame Over {ctx.author.mention}! The correct word was **{answer}**. "
@@ -125,28 +127,10 @@ class Wordle(commands.Cog):
         # Delete the command message to keep the channel clean
         await ctx.message.delete()
 
-        streaks = []
-        for filename in os.listdir(ECONOMY_FOLDER):
-            if not filename.endswith(".json"):
-                continue
-
-            user_id_str = filename[:-5]  # strip ".json"
-            if not user_id_str.isdigit():
-                continue
-
-            filepath = os.path.join(ECONOMY_FOLDER, filename)
-            try:
-                with open(filepath, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception as e:
-                print(f"Error reading {filename}: {e}")
-                continue
-
-            streak = int(data.get("wordle_streak", 0) or 0)
-            streaks.append((int(user_id_str), streak))
-
-        streaks.sort(key=lambda x: x[1], reverse=True)
-        top10 = streaks[:10]
+        top10 = [
+            (int(user_id_str), summary["wordle_streak"])
+            for user_id_str, summary in await atop("wordle", 10)
+        ]
 
         if not top10:
             description = "No streak data available."
@@ -1,85 +1,328 @@
 # cogs/xp.py
+import time
+import asyncio
+from collections import deque
 import discord
-from discord.ext import commands
+from discord.ext import commands, tasks
+import config
 from config import (
     ENABLE_XP_SYSTEM,
     SHOW_LEVEL_UP_MESSAGES,
     XP_NOTIFICATION_CHANNEL_ID,
-    XP_PER_MESSAGE,
-    XP_PER_REACTION,
-    XP_PER_COMMAND,
-    LEVEL_UP_REWARD_MULTIPLIER,
+    XP_FLUSH_INTERVAL,
+    LEVEL_UP_ANNOUNCE_WINDOW,
+    LEVEL_UP_EDIT_WINDOW,
+    VOICE_XP_CHECKPOINT,
     CURRENCY_NAME,
     CURRENCY_SYMBOL,
 )
-from utils.xp import award_xp
+from utils.economy import run_io
+from utils.xp import xp_buffer
+from utils.voice_xp import VoiceSessions
 from utils.embed import create_embed
 
 
+class XPRateLimiter:
+    """
+    Per-member token buckets per event kind ("message", "command", "reaction"),
+    plus a short window of recent message hashes so repeats earn nothing.
+    Limits are read from config on every check, so !config set applies at once.
+    """
+
+    IDLE_SECONDS = 600  # a member's state is kept at least this long after their last event
+
+    def __init__(self):
+        self._buckets = {}      # (user_id, kind) -> [tokens, last_refill]
+        self._recent = {}       # user_id -> deque of recent message content hashes
+        self._recent_at = {}    # user_id -> time of their last checked message
+
+    @staticmethod
+    def _limits(kind: str) -> tuple[int, int]:
+        name = kind.upper()
+        burst = getattr(config, f"XP_RATE_{name}_BURST")
+        refill = getattr(config, f"XP_RATE_{name}_REFILL")
+        return max(1, int(burst)), max(0, int(refill))
+
+    def allow(self, user_id: int, kind: str) -> bool:
+        """Takes one token from the member's `kind` bucket if one is available."""
+        burst, refill = self._limits(kind)
+        now = time.monotonic()
+        bucket = self._buckets.get((user_id, kind))
+        if bucket is None:
+            bucket = self._buckets[(user_id, kind)] = [float(burst), now]
+        elif refill:
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) / refill)
+            bucket[1] = now
+        else:
+            bucket[0] = burst  # refill 0 = no limit
+
+        if bucket[0] < 1:
+            return False
+        bucket[0] -= 1
+        return True
+
+    def is_repeat(self, user_id: int, content: str) -> bool:
+        """True if the same text (case/whitespace-insensitive) was among the member's last messages."""
+        size = int(config.XP_REPEAT_WINDOW)
+        text = " ".join(content.lower().split())
+        if size <= 0 or not text:
+            return False
+
+        self._recent_at[user_id] = time.monotonic()
+        recent = self._recent.get(user_id)
+        if recent is None or recent.maxlen != size:
+            recent = self._recent[user_id] = deque(recent or (), maxlen=size)
+        digest = hash(text)
+        if digest in recent:
+            return True
+        recent.append(digest)
+        return False
+
+    def prune(self) -> None:
+        """Forgets buckets that are full again and repeat windows of members who went quiet."""
+        now = time.monotonic()
+        for key, (tokens, last) in list(self._buckets.items()):
+            burst, refill = self._limits(key[1])
+            # A refill-0 (unlimited) bucket is never "refilling", so only idle time counts
+            if now - last > max(burst * refill, self.IDLE_SECONDS):
+                del self._buckets[key]
+
+        # Expired on their own clock: a stale bucket says nothing about recent messages
+        for user_id, last in list(self._recent_at.items()):
+            if now - last > self.IDLE_SECONDS:
+                del self._recent_at[user_id]
+                self._recent.pop(user_id, None)
+
+
+class LevelUpAnnouncer:
+    """
+    Collects level-ups per channel for LEVEL_UP_ANNOUNCE_WINDOW seconds and posts
+    them as one embed, or edits the previous announcement if it is recent and
+    still the channel's latest message. That keeps announcements to one request
+    per channel per window (more only past MAX_LINES level-ups), and a shared
+    lock keeps only one in flight at a time, so the channel's rate-limit bucket
+    is left to command responses.
+    """
+
+    MAX_LINES = 25
+
+    def __init__(self):
+        self._pending = {}  # channel_id -> {member_id: (member, level, reward)}
+        self._tasks = {}    # channel_id -> asyncio.Task waiting out the window
+        self._last = {}     # channel_id -> (message, sent_at, lines)
+        self._send_lock = asyncio.Lock()
+
+    def queue(self, channel, member, level: int, reward: int) -> None:
+        pending = self._pending.setdefault(channel.id, {})
+        previous = pending.get(member.id)
+        if previous is not None:
+            # Several levels in one window: announce the highest, sum the rewards
+            level, reward = max(level, previous[1]), reward + previous[2]
+        pending[member.id] = (member, level, reward)
+
+        if channel.id not in self._tasks:
+            self._tasks[channel.id] = asyncio.create_task(self._post_later(channel))
+
+    def cancel(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    @staticmethod
+    def _line(member, level: int, reward: int) -> str:
+        return (
+            f"{member.mention} reached level **{level}** "
+            f"and earned **{CURRENCY_SYMBOL}{reward}** {CURRENCY_NAME}"
+        )
+
+    async def _post_later(self, channel) -> None:
+        try:
+            await asyncio.sleep(LEVEL_UP_ANNOUNCE_WINDOW)
+        finally:
+            self._tasks.pop(channel.id, None)
+        entries = list(self._pending.pop(channel.id, {}).values())
+        if not entries:
+            return
+
+        lines = [self._line(*entry) for entry in entries]
+        async with self._send_lock:
+            try:
+                await self._post(channel, lines, entries)
+            except Exception as e:
+                print(f"[XP] Failed to send level-up message: {e}")
+
+    async def _post(self, channel, lines, entries) -> None:
+        now = time.monotonic()
+        last = self._last.get(channel.id)
+        if last is not None:
+            message, sent_at, previous_lines = last
+            combined = previous_lines + lines
+            if (
+                now - sent_at < LEVEL_UP_EDIT_WINDOW
+                and channel.last_message_id == message.id
+                and len(combined) <= self.MAX_LINES
+            ):
+                await message.edit(embed=await self._embed(combined))
+                self._last[channel.id] = (message, sent_at, combined)
+                return
+
+        if len(entries) == 1:
+            # Same wording as a single announcement always had
+            member, level, reward = entries[0]
+            embed = await create_embed(
+                title="Level Up!",
+                description=(
+                    f"{member.mention}, you reached level **{level}** "
+                    f"and earned **{CURRENCY_SYMBOL}{reward}** {CURRENCY_NAME}"
+                ),
+                color=discord.Color.green(),
+            )
+            message = await channel.send(embed=embed)
+            self._last[channel.id] = (message, now, lines)
+            return
+
+        # MAX_LINES per embed; a busy window gets follow-up embeds instead of dropping anyone
+        for start in range(0, len(lines), self.MAX_LINES):
+            chunk = lines[start:start + self.MAX_LINES]
+            message = await channel.send(embed=await self._embed(chunk))
+        # Only the last message can be extended, with exactly the lines it shows
+        self._last[channel.id] = (message, now, chunk)
+
+    @staticmethod
+    async def _embed(lines) -> discord.Embed:
+        return await create_embed(
+            title="Level Up!" if len(lines) == 1 else "Level Ups!",
+            description="\n".join(lines),
+            color=discord.Color.green(),
+        )
+
+
 class XP(commands.Cog):
     """Cog to award XP and handle level-up rewards."""
 
     def __init__(self, bot):
         self.bot = bot
+        self.limiter = XPRateLimiter()
+        self.announcer = LevelUpAnnouncer()
+        self.voice = VoiceSessions()
 
-    async def send_level_up_message(self, member, level, channel):
-        if not SHOW_LEVEL_UP_MESSAGES:
+    async def cog_load(self):
+        self.flush_xp.start()
+        self.voice_checkpoint.start()
+
+    async def cog_unload(self):
+        self.flush_xp.cancel()
+        self.voice_checkpoint.cancel()
+        self.announcer.cancel()
+        await self.pay_voice(self.voice.collect())
+        await self.announce(await run_io(xp_buffer.flush))
+
+    @tasks.loop(seconds=XP_FLUSH_INTERVAL)
+    async def flush_xp(self):
+        """Writes buffered XP to the economy in one batch."""
+        await self.announce(await run_io(xp_buffer.flush))
+        self.limiter.prune()
+
+    @tasks.loop(seconds=VOICE_XP_CHECKPOINT)
+    async def voice_checkpoint(self):
+        """Pays voice XP for ongoing sessions (and leftovers) without waiting for them to end."""
+        await self.pay_voice(self.voice.collect())
+
+    @voice_checkpoint.before_loop
+    async def before_voice_checkpoint(self):
+        # Pick up members who were already in voice when the bot (re)started
+        await self.bot.wait_until_ready()
+        for guild in self.bot.guilds:
+            for channel in guild.voice_channels + guild.stage_channels:
+                self.voice.refresh(channel)
+
+    async def pay_voice(self, earned, channel=None):
+        """
+        `channel` is where level-ups are announced; by default the member's current
+        voice channel, or the server's system channel once they have left voice.
+        """
+        if not ENABLE_XP_SYSTEM:
             return
+        for member, minutes in earned:
+            target = channel or (member.voice.channel if member.voice else None) or member.guild.system_channel
+            await self.award(member, minutes * config.XP_PER_VOICE_MINUTE, target)
 
-        reward = int(LEVEL_UP_REWARD_MULTIPLIER * level)
+    async def award(self, member, amount, channel):
+        # Buffered; pass the member object so economy can auto-refresh username/display_name
+        await self.announce(await run_io(xp_buffer.add, member, amount, channel))
 
-        embed = await create_embed(
-            title="Level Up!",
-            description=(
-                f"{member.mention}, you reached level **{level}** "
-                f"and earned **{CURRENCY_SYMBOL}{reward}** {CURRENCY_NAME}"
-            ),
-            color=discord.Color.green(),
-        )
+    async def announce(self, level_ups):
+        for member, level, reward, channel in level_ups:
+            await self.send_level_up_message(member, level, reward, channel)
 
-        try:
-            if XP_NOTIFICATION_CHANNEL_ID:
-                notify_channel = self.bot.get_channel(XP_NOTIFICATION_CHANNEL_ID)
-                if notify_channel:
-                    await notify_channel.send(embed=embed)
-                    return
+    async def send_level_up_message(self, member, level, reward, channel):
+        """`reward` is what add_xp actually paid, covering every level crossed."""
+        if not SHOW_LEVEL_UP_MESSAGES:
+            return
+
+        if XP_NOTIFICATION_CHANNEL_ID:
+            notify_channel = self.bot.get_channel(XP_NOTIFICATION_CHANNEL_ID)
+            if notify_channel:
+                channel = notify_channel
+
+        # Coalesced with other level-ups in the same channel (see LevelUpAnnouncer)
+        if channel is None:
+            return
+        self.announcer.queue(channel, member, level, reward)
 
-            await channel.send(embed=embed)
-        except Exception as e:
-            print(f"[XP] Failed to send level-up message: {e}")
+    async def classify_message(self, message) -> tuple[str, int]:
+        """
+        Classifies a message once as "command" or "message" and returns the total
+        XP for it, so a command is never awarded twice (message + command).
+        Amounts are read from config at call time so !config set applies immediately.
+        """
+        ctx = await self.bot.get_context(message)
+        if ctx.valid:
+            amount = config.XP_PER_COMMAND
+            if config.COMMAND_MESSAGES_EARN_MESSAGE_XP:
+                amount += config.XP_PER_MESSAGE
+            return "command", amount
+        return "message", config.XP_PER_MESSAGE
 
     @commands.Cog.listener()
     async def on_message(self, message):
         if not ENABLE_XP_SYSTEM or message.author.bot:
             return
 
-        # Pass the member/user object so economy can auto-refresh username/display_name
-        leveled, level, _ = award_xp(message.author, XP_PER_MESSAGE)
+        kind, amount = await self.classify_message(message)
+
+        # Spam never reaches the economy: repeated text, then the per-kind bucket
+        if kind == "message" and self.limiter.is_repeat(message.author.id, message.content):
+            return
+        if not self.limiter.allow(message.author.id, kind):
+            return
 
-        if leveled:
-            await self.send_level_up_message(message.author, level, message.channel)
+        await self.award(message.author, amount, message.channel)
 
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction, user):
         if not ENABLE_XP_SYSTEM or user.bot:
             return
 
-        # Pass the member/user object so economy can auto-refresh username/display_name
-        leveled, level, _ = award_xp(user, XP_PER_REACTION)
+        if not self.limiter.allow(user.id, "reaction"):
+            return
+
+        await self.award(user, config.XP_PER_REACTION, reaction.message.channel)
 
-        if leveled:
-            await self.send_level_up_message(user, level, reaction.message.channel)
 
     @commands.Cog.listener()
-    async def on_command(self, ctx):
-        if not ENABLE_XP_SYSTEM or ctx.author.bot:
+    async def on_voice_state_update(self, member, before, after):
+        if member.bot:
             return
 
-        # Pass the member/user object so economy can auto-refresh username/display_name
-        leveled, level, _ = award_xp(ctx.author, XP_PER_COMMAND)
+        # Joins, leaves, moves and mutes can change who is earning in both channels
+        for channel in {before.channel, after.channel} - {None}:
+            self.voice.refresh(channel)
 
-        if leveled:
-            await self.send_level_up_message(ctx.author, level, ctx.channel)
+        # Session over for this member: pay now instead of at the next checkpoint,
+        # announcing in the channel they were in (member.voice is gone once they leave)
+        if not self.voice.is_earning(member.id):
+            await self.pay_voice(self.voice.collect(member.id), before.channel or after.channel)
 
 
 async def setup(bot):
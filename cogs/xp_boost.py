@@ -0,0 +1,104 @@
+# cogs/xp_boost.py
+import re
+import discord
+from discord.ext import commands
+from config import MODERATOR_ROLE_ID
+from utils.economy import user_key
+from utils.embed import create_embed
+from utils.xp_boosts import boosts, SERVER
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_duration(text: str) -> int:
+    """'90m', '2h', '1d12h' or plain minutes -> seconds (raises BadArgument)."""
+    text = text.strip().lower()
+    if text.isdigit():
+        return int(text) * 60
+    parts = re.findall(r"(\d+)([smhd])", text)
+    if not parts or "".join(n + u for n, u in parts) != text:
+        raise commands.BadArgument(f"Invalid duration `{text}` (use e.g. 30m, 2h, 1d).")
+    return sum(int(n) * DURATION_UNITS[u] for n, u in parts)
+
+
+class XPBoost(commands.Cog):
+    """Moderator commands for timed XP multipliers (per member or server-wide)."""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    @commands.group(name="xpboost", invoke_without_command=True)
+    @commands.has_role(MODERATOR_ROLE_ID)
+    async def xpboost(self, ctx, member: discord.Member, multiplier: float, duration: str):
+        """
+        Give a member a timed XP multiplier.
+        Usage: xpboost @User <multiplier> <duration>   e.g. !xpboost @User 2 1h
+        """
+        await self.grant(ctx, user_key(member), member.mention, multiplier, duration)
+
+    @xpboost.command(name="server")
+    @commands.has_role(MODERATOR_ROLE_ID)
+    async def xpboost_server(self, ctx, multiplier: float, duration: str):
+        """
+        Give everyone a timed XP multiplier.
+        Usage: xpboost server <multiplier> <duration>   e.g. !xpboost server 1.5 2h
+        """
+        await self.grant(ctx, SERVER, "everyone", multiplier, duration)
+
+    @xpboost.command(name="clear")
+    @commands.has_role(MODERATOR_ROLE_ID)
+    async def xpboost_clear(self, ctx, member: discord.Member | None = None):
+        """
+        Remove a member's boost, or the server-wide boost when no member is given.
+        Usage: xpboost clear [@User]
+        """
+        key = user_key(member) if member else SERVER
+        target = member.mention if member else "the server"
+        if boosts.revoke(key):
+            await ctx.send(f"Removed the XP boost for {target}.")
+        else:
+            await ctx.send(f"There is no active XP boost for {target}.")
+
+    @xpboost.command(name="list")
+    async def xpboost_list(self, ctx):
+        """Show active XP boosts."""
+        lines = []
+        for key, (mult, expires_at) in sorted(boosts.active().items(), key=lambda kv: kv[1][1]):
+            if key == SERVER:
+                target = "**Server-wide**"
+            else:
+                member = ctx.guild.get_member(int(key))
+                target = member.mention if member else f"`{key}`"
+            lines.append(f"{target} — x{mult:g} — ends <t:{int(expires_at)}:R>")
+
+        embed = await create_embed(
+            title="Active XP Boosts",
+            description="\n".join(lines) or "No XP boosts are active.",
+            color=discord.Color.green()
+        )
+        await ctx.send(embed=embed)
+
+    async def grant(self, ctx, key: str, target: str, multiplier: float, duration: str):
+        if multiplier <= 1.0 or multiplier > 10:
+            await ctx.send("The multiplier must be above 1 and at most 10.")
+            return
+
+        try:
+            seconds = parse_duration(duration)
+        except commands.BadArgument as e:
+            await ctx.send(str(e))
+            return
+        if seconds <= 0:
+            await ctx.send("The duration must be positive.")
+            return
+
+        _, expires_at = boosts.grant(key, multiplier, seconds)
+        embed = await create_embed(
+            title="XP Boost Active!",
+            description=f"{ctx.author.mention} gave {target} **x{multiplier:g} XP** until <t:{int(expires_at)}:f> (<t:{int(expires_at)}:R>).",
+            color=discord.Color.green()
+        )
+        await ctx.send(embed=embed)
+
+
+async def setup(bot):
+    await bot.add_cog(XPBoost(bot))
@@ -15,7 +15,31 @@ OPENWEBUI_API_URL = os.getenv("OPENWEBUI_API_URL")     # Pulled from .env file
 # Non-sensitive settings (Additional bot settings that are okay to share)
 COMMAND_PREFIX = "!"              # Change value if you want different prefix.
 MODEL_NAME = "devros-mini"        # Set your model name here.
+LLM_MAX_CONNECTIONS = 8                # Pooled connections to OpenWebUI shared by every LLM request (0 = no limit)
+LLM_MAX_CONNECTIONS_PER_HOST = 4       # Of those, how many may go to the same host at once (0 = no limit)
+LLM_DNS_CACHE_SECONDS = 300            # How long the OpenWebUI host name lookup is reused
+LLM_KEEPALIVE_SECONDS = 60             # Idle time before a pooled connection is closed
+LLM_REQUEST_TIMEOUT = 300              # Seconds an LLM request may take in total before it fails
 ECONOMY_FOLDER = "data/ecoonomy"       # Folder where server members economy files are saved
+ECONOMY_BACKEND = "json"               # "json" (one file per member in ECONOMY_FOLDER) or "sqlite"
+ECONOMY_DB_PATH = "data/economy.db"    # SQLite database used when ECONOMY_BACKEND = "sqlite" (seeded from ECONOMY_FOLDER on first run)
+ECONOMY_CACHE_SIZE = 1000              # Max member records kept in memory (least recently used are evicted)
+ECONOMY_FLUSH_INTERVAL = 30            # Seconds between batched writes of changed records to disk (also compacts the ledger)
+ECONOMY_IO_WORKERS = 4                 # Threads used by the async economy API for disk/database work
+ECONOMY_LEDGER_ENABLED = True          # Append every economy change to a crash-safe log (replayed on startup)
+ECONOMY_LEDGER_FOLDER = "data/economy_ledger"  # Folder for ledger segment files
+ECONOMY_LEDGER_COMMIT_MS = 5           # Group-commit window: ledger appends are fsynced together this often
+
+# Profile Card Rendering
+AVATAR_CACHE_FOLDER = "data/avatar_cache"   # Downloaded avatars (reused across restarts)
+AVATAR_CACHE_MEMORY_MB = 32                 # Memory budget for decoded avatars (least recently used are dropped)
+PROFILE_RENDER_MODE = "thread"              # Render workers: "thread" or "process" (separate processes, no GIL contention)
+PROFILE_RENDER_WORKERS = 2                  # Profile cards rendered at the same time
+PROFILE_RENDER_QUEUE = 16                   # Renders allowed to wait for a worker; more are refused until the queue drains
+PROFILE_RENDER_CACHE_MB = 8                 # Memory budget for finished profile images (plus the Discord URL of their last upload)
+PROFILE_CARD_FONT = ""                      # .ttf/.otf used for text on !card (empty = Pillow's built-in font)
+PROFILE_CARD_ENCODER = "png-fast"           # Image format for !card: "png", "png-fast", "webp" (lossless) or "png-palette" (256 colors)
+PROFILE_THUMBNAIL_ENCODER = "png-fast"      # Image format for the !profile thumbnail (same choices)
 
 # Bot Info
 BOT_NAME = "Devros"                           # The name of your bot
@@ -28,10 +52,29 @@ MODERATOR_ROLE_ID = 1035393475631394896      # Role ID for server mods
 ENABLE_XP_SYSTEM = True           # Set to False to disable XP System
 SHOW_LEVEL_UP_MESSAGES = True     # Set to False to disable level up messages
 XP_NOTIFICATION_CHANNEL_ID = None  # Replace with your actual channel ID, or set to None to use current channel
+LEVEL_UP_ANNOUNCE_WINDOW = 3      # Seconds level-ups in a channel are collected into one announcement
+LEVEL_UP_EDIT_WINDOW = 60         # A newer batch edits the last announcement if it is this recent and still the latest message
 XP_PER_MESSAGE =  1               # XP gained from regular messages
 XP_PER_REACTION = 1               # XP gained from reacting to messages
 XP_PER_COMMAND = 5                # XP gained from using Devros commands
+XP_PER_VOICE_MINUTE = 1           # XP per minute spent talking in voice (not AFK, muted or alone)
+VOICE_XP_CHECKPOINT = 300         # Seconds between voice XP payouts for sessions still running
+VOICE_XP_MIN_MEMBERS = 2          # Members (not bots, not muted) needed in a channel to earn voice XP
+VOICE_XP_ALLOW_MUTED = False      # True = muted / deafened members still earn voice XP
+COMMAND_MESSAGES_EARN_MESSAGE_XP = False  # True = a command message earns XP_PER_MESSAGE on top of XP_PER_COMMAND
+XP_RATE_MESSAGE_BURST = 5         # Messages that can earn XP back to back...
+XP_RATE_MESSAGE_REFILL = 12       # ...then one more every N seconds (0 = no limit)
+XP_RATE_COMMAND_BURST = 3         # Same for command messages
+XP_RATE_COMMAND_REFILL = 30
+XP_RATE_REACTION_BURST = 5        # Same for reactions
+XP_RATE_REACTION_REFILL = 20
+XP_REPEAT_WINDOW = 5              # A message identical to one of your last N messages earns no XP (0 = off)
+XP_FLUSH_INTERVAL = 10            # Seconds between batched writes of buffered XP to the economy
+XP_FLUSH_MAX_EVENTS = 500         # Also write buffered XP once this many XP events are waiting
 LEVEL_UP_REWARD_MULTIPLIER = 100     # Default value Level Up reward (Value * LVL Earned)
+XP_CURVE = "linear"               # XP per level: "linear" (XP_CURVE_BASE * level), "quadratic" (XP_CURVE_BASE * level^2) or "table"
+XP_CURVE_BASE = 100               # Base XP of the linear / quadratic curve
+XP_CURVE_TABLE = []               # For "table": XP needed per level, e.g. [100, 250, 500] (last value repeats)
 
 # Server Economy Settings
 ## Currency Values
@@ -0,0 +1,266 @@
+# render_benchmark.py
+"""
+Offline benchmark for profile rendering (no Discord connection needed).
+
+Builds fake members with local avatar images (PNG/JPEG/WebP of several sizes
+and an animated GIF), then drives render_profile_card and
+render_profile_thumbnail over every frame in data/profile_frames at each size,
+encoder and concurrency level. Prints (or writes) JSON with p50/p95 latency,
+throughput and peak RSS, and can diff against an earlier run:
+
+    python render_benchmark.py --output before.json
+    python render_benchmark.py --compare before.json
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import platform
+import tempfile
+from io import BytesIO
+from typing import List, Optional
+
+import PIL
+from PIL import Image, ImageDraw
+
+try:
+    import resource  # not available on Windows
+except ImportError:
+    resource = None
+
+import config
+from utils import profile_card
+from utils.avatar_cache import AvatarCache
+from utils.frame_assets import frame_assets
+from utils.image_encoder import ENCODER_PROFILES
+from utils.render_cache import RenderCache
+from utils.render_pool import RenderPool
+
+# ---------- Fake Discord objects ----------
+
+class FakeAsset:
+    """Stands in for discord.Asset: a stable key plus bytes served from memory."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.key = hashlib.sha1(data).hexdigest()[:16]
+
+    def replace(self, **kwargs) -> "FakeAsset":
+        return self
+
+    async def read(self) -> bytes:
+        return self.data
+
+class FakeMember:
+    def __init__(self, member_id: int, name: str, avatar: bytes):
+        self.id = member_id
+        self.bot = False
+        self.display_name = name
+        self.display_avatar = FakeAsset(avatar)
+
+def _gradient(size: int, seed: int) -> Image.Image:
+    image = Image.new("RGB", (size, size))
+    draw = ImageDraw.Draw(image)
+    for y in range(size):
+        shade = (seed * 53 + y * 255 // size) % 256
+        draw.line([(0, y), (size, y)], fill=(shade, (shade + seed * 31) % 256, 255 - shade))
+    draw.ellipse([size // 4, size // 4, size * 3 // 4, size * 3 // 4], fill=(250, 250, 250))
+    return image
+
+def _encode(image: Image.Image, fmt: str, **options) -> bytes:
+    out = BytesIO()
+    image.save(out, format=fmt, **options)
+    return out.getvalue()
+
+def synthetic_avatars() -> List[tuple]:
+    """(label, bytes) for the avatar shapes Discord actually serves."""
+    frames = [_gradient(256, seed) for seed in range(8)]
+    return [
+        ("png-128", _encode(_gradient(128, 1), "PNG")),
+        ("png-512", _encode(_gradient(512, 2), "PNG")),
+        ("jpeg-1024", _encode(_gradient(1024, 3), "JPEG", quality=90)),
+        ("webp-256", _encode(_gradient(256, 4), "WEBP")),
+        ("gif-256-animated", _encode(frames[0], "GIF", save_all=True, append_images=frames[1:], duration=80, loop=0)),
+    ]
+
+def folder_avatars(folder: str) -> List[tuple]:
+    avatars = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                avatars.append((name, f.read()))
+    return avatars
+
+# ---------- Measurement ----------
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process plus finished worker processes (KiB)."""
+    if resource is None:
+        return None
+    scale = 1024 if sys.platform == "darwin" else 1  # macOS reports bytes
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss // scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss // scale
+    return own + children
+
+def percentile(values: List[float], p: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return round(values[min(len(values) - 1, int(p * len(values)))], 2)
+
+def card_stats(member: FakeMember, i: int) -> "profile_card.CardStats":
+    return profile_card.CardStats(
+        name=member.display_name,
+        level=1 + i % 50,
+        xp=(i * 37) % 900,
+        needed=1000,
+        currency=config.CURRENCY_NAME,
+        balance=i * 1234,
+        wordle_streak=i % 7,
+        connect4_streak=i % 3,
+        battleship_streak=i % 5,
+    )
+
+async def run_case(renderer: str, size: int, encoder: str, concurrency: int, members, frames, repeat: int) -> dict:
+    jobs = [(m, f) for _ in range(repeat) for m in members for f in frames]
+
+    async def render(i: int, member: FakeMember, frame_id: Optional[str]):
+        accent = "#%06x" % ((i * 2654435761) & 0xFFFFFF)
+        if renderer == "card":
+            return await profile_card.render_profile_card(member, frame_id, accent, card_stats(member, i), encoder=encoder)
+        return await profile_card.render_profile_thumbnail(member, frame_id, accent, size, encoder=encoder)
+
+    # Warm-up: avatar decode, frame variants and fonts are not what we measure
+    for member in members:
+        for frame_id in frames:
+            await render(0, member, frame_id)
+
+    latencies, sizes = [], []
+    queue = list(enumerate(jobs))
+    queue.reverse()
+
+    async def worker():
+        while queue:
+            i, (member, frame_id) = queue.pop()
+            started = time.perf_counter()
+            image = await render(i, member, frame_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+            sizes.append(len(image.data))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "renderer": renderer,
+        "size": size,
+        "encoder": encoder,
+        "concurrency": concurrency,
+        "renders": len(latencies),
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "throughput_per_s": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "avg_kb": round(sum(sizes) / len(sizes) / 1024, 1) if sizes else 0.0,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+def _case_key(case: dict) -> tuple:
+    return (case["renderer"], case["size"], case["encoder"], case["concurrency"])
+
+def compare(results: dict, baseline_path: str) -> None:
+    with open(baseline_path, "r") as f:
+        baseline = {_case_key(c): c for c in json.load(f).get("cases", [])}
+
+    print(f"{'case':<40} {'p50 ms':>16} {'p95 ms':>16} {'renders/s':>18}", file=sys.stderr)
+    for case in results["cases"]:
+        old = baseline.get(_case_key(case))
+        if old is None:
+            continue
+
+        def delta(field):
+            before, after = old[field], case[field]
+            change = f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+            return f"{after} ({change})"
+
+        label = "{}/{}/{}/x{}".format(*_case_key(case))
+        print(f"{label:<40} {delta('p50_ms'):>16} {delta('p95_ms'):>16} {delta('throughput_per_s'):>18}", file=sys.stderr)
+
+async def main(args) -> dict:
+    avatars = folder_avatars(args.avatars) if args.avatars else synthetic_avatars()
+    members = [FakeMember(1000 + i, f"Bench {label}", data) for i, (label, data) in enumerate(avatars)]
+    frames = [None] + frame_assets.ids()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # Isolated caches: never touch data/avatar_cache, and don't let finished
+        # images short-circuit the renders we're timing
+        profile_card.avatar_cache = AvatarCache(folder=cache_dir)
+        profile_card.render_cache = RenderCache(max_bytes=args.render_cache_mb * 1024 * 1024)
+
+        cases = []
+        for concurrency in args.concurrency:
+            profile_card.render_pool = RenderPool(workers=args.workers, mode=args.mode, max_queue=max(concurrency, 1))
+            try:
+                for encoder in args.encoders:
+                    cases.append(await run_case("card", profile_card.CARD_SIZE[0], encoder, concurrency, members, frames, args.repeat))
+                    for size in args.sizes:
+                        cases.append(await run_case("thumbnail", size, encoder, concurrency, members, frames, args.repeat))
+            finally:
+                profile_card.render_pool.shutdown()
+
+    return {
+        "meta": {
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "pillow": PIL.__version__,
+            "machine": platform.machine(),
+            "renderer_version": profile_card.RENDERER_VERSION,
+            "mode": args.mode,
+            "workers": args.workers,
+            "avatars": [label for label, _ in avatars],
+            "frames": [f or "none" for f in frames],
+            "repeat": args.repeat,
+        },
+        "cases": cases,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+def _int_list(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark profile card / thumbnail rendering offline.")
+    parser.add_argument("--mode", default=config.PROFILE_RENDER_MODE, choices=["thread", "process"])
+    parser.add_argument("--workers", type=int, default=config.PROFILE_RENDER_WORKERS)
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 4, 16], help="comma separated, e.g. 1,4,16")
+    parser.add_argument("--sizes", type=_int_list, default=[64, 128, 256, 512], help="thumbnail sizes")
+    parser.add_argument("--encoders", type=lambda v: v.split(","), default=sorted({config.PROFILE_CARD_ENCODER, config.PROFILE_THUMBNAIL_ENCODER}),
+                        help=f"comma separated: {', '.join(ENCODER_PROFILES)}")
+    parser.add_argument("--repeat", type=int, default=5, help="renders per member/frame pair")
+    parser.add_argument("--avatars", help="folder of avatar images to use instead of synthetic ones")
+    parser.add_argument("--render-cache-mb", type=int, default=0, help="render cache budget (0 = always render)")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON output to print p50/p95/throughput changes against")
+    args = parser.parse_args(argv)
+    for encoder in args.encoders:
+        if encoder not in ENCODER_PROFILES:
+            parser.error(f"unknown encoder '{encoder}'")
+    return args
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = asyncio.run(main(args))
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"[Bench] Wrote {len(results['cases'])} cases to {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        compare(results, args.compare)
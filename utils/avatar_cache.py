@@ -0,0 +1,163 @@
+# utils/avatar_cache.py
+import os
+import asyncio
+import threading
+from io import BytesIO
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+import discord
+from PIL import Image
+
+from config import AVATAR_CACHE_FOLDER, AVATAR_CACHE_MEMORY_MB
+
+# (user_id, avatar hash, size)
+AvatarKey = Tuple[int, str, int]
+
+class AvatarCache:
+    """
+    Decoded RGBA avatars keyed by (user id, avatar hash, size).
+
+    Two tiers: an in-memory LRU bounded by decoded size (width * height * 4
+    bytes) and the downloaded files in AVATAR_CACHE_FOLDER, so a restart does not
+    re-download everyone. A new avatar has a new hash, so it is simply a miss; the
+    member's older files are deleted when it is stored. Returned images are shared:
+    callers must copy/resize rather than draw on them.
+    """
+
+    def __init__(self, folder: str = AVATAR_CACHE_FOLDER, max_bytes: int = AVATAR_CACHE_MEMORY_MB * 1024 * 1024):
+        self.folder = folder
+        self.max_bytes = max(0, int(max_bytes))
+        self._images: "OrderedDict[AvatarKey, Image.Image]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: Dict[AvatarKey, asyncio.Future] = {}
+        self.hits = 0        # served from memory
+        self.disk_hits = 0   # decoded from AVATAR_CACHE_FOLDER
+        self.misses = 0      # downloaded from Discord
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    @staticmethod
+    def key_for(member: discord.abc.User, size: int) -> AvatarKey:
+        return (member.id, member.display_avatar.key, int(size))
+
+    def _path(self, key: AvatarKey) -> str:
+        user_id, avatar_hash, size = key
+        return os.path.join(self.folder, f"{user_id}_{avatar_hash}_{size}.img")
+
+    # ---------- Memory tier ----------
+
+    def _lookup(self, key: AvatarKey):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+            return image
+
+    def _remember(self, key: AvatarKey, image: Image.Image) -> None:
+        cost = image.width * image.height * 4
+        if cost > self.max_bytes:
+            return
+        with self._lock:
+            old = self._images.pop(key, None)
+            if old is not None:
+                self._bytes -= old.width * old.height * 4
+            self._images[key] = image
+            self._bytes += cost
+            while self._bytes > self.max_bytes:
+                _, evicted = self._images.popitem(last=False)
+                self._bytes -= evicted.width * evicted.height * 4
+
+    # ---------- Disk tier ----------
+
+    @staticmethod
+    def _decode(data: bytes) -> Image.Image:
+        image = Image.open(BytesIO(data)).convert("RGBA")
+        image.load()
+        return image
+
+    def _read_disk(self, key: AvatarKey):
+        try:
+            with open(self._path(key), "rb") as f:
+                return self._decode(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"[Avatar] Dropping unreadable cache file {self._path(key)}: {e}")
+            self._discard(self._path(key))
+            return None
+
+    def _write_disk(self, key: AvatarKey, data: bytes) -> Image.Image:
+        user_id, _, size = key
+        path = self._path(key)
+        # The member's previous avatar(s) at this size are now stale
+        suffix = f"_{size}.img"
+        for name in os.listdir(self.folder):
+            if name.startswith(f"{user_id}_") and name.endswith(suffix) and os.path.join(self.folder, name) != path:
+                self._discard(os.path.join(self.folder, name))
+
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"[Avatar] Failed to cache avatar on disk: {e}")
+        return self._decode(data)
+
+    @staticmethod
+    def _discard(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # ---------- Public API ----------
+
+    async def get(self, member: discord.abc.User, size: int = 512) -> Image.Image:
+        """RGBA avatar of `member` as served by Discord at `size` (static PNG for still avatars)."""
+        key = self.key_for(member, size)
+        image = self._lookup(key)
+        if image is not None:
+            return image
+
+        # Concurrent requests for the same avatar share one load
+        pending = self._inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            image = await asyncio.to_thread(self._read_disk, key)
+            if image is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                asset = member.display_avatar.replace(size=size, static_format="png")
+                data = await asset.read()
+                image = await asyncio.to_thread(self._write_disk, key, data)
+            self._remember(key, image)
+            future.set_result(image)
+            return image
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._images),
+                "memory_bytes": self._bytes,
+            }
+
+
+avatar_cache = AvatarCache()
@@ -1,23 +1,289 @@
-import os
-import json
-from typing import Union, Optional
+import time
+import atexit
+import asyncio
+import functools
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union, Optional
 
 import discord
 from config import (
     ECONOMY_FOLDER,
+    ECONOMY_BACKEND,
+    ECONOMY_DB_PATH,
+    ECONOMY_CACHE_SIZE,
+    ECONOMY_FLUSH_INTERVAL,
+    ECONOMY_IO_WORKERS,
+    ECONOMY_LEDGER_ENABLED,
+    ECONOMY_LEDGER_FOLDER,
+    ECONOMY_LEDGER_COMMIT_MS,
     DEFAULT_CURRENCY_GIVE,
     DEFAULT_CURRENCY_TAKE,
-    LEVEL_UP_REWARD_MULTIPLIER
 )
+from utils.economy_store import EconomyStore, create_store
+from utils.economy_record import EconomyRecord
+from utils.economy_ledger import EconomyLedger
+from utils.xp_boosts import boosts
+from utils.xp_curve import curve, level_up_reward
 
 EconomyIdentity = Union[str, discord.abc.User]  # str = user_id, or a Member/User
 
+class InsufficientFunds(Exception):
+    """Raised by withdraw() (and therefore inside a transaction) when a balance is too low."""
+
 def user_key(member: discord.abc.User) -> str:
     """Centralized economy identity. Uses Discord user ID."""
     return str(member.id)
 
-if not os.path.exists(ECONOMY_FOLDER):
-    os.makedirs(ECONOMY_FOLDER)
+# ---------- Record schema migrations ----------
+
+SCHEMA_VERSION = 2  # bump when adding a new @migration step
+
+_MIGRATIONS: Dict[int, Callable[[EconomyRecord], None]] = {}
+
+def migration(from_version: int):
+    """Registers a step that upgrades a record from `from_version` to `from_version + 1`."""
+    def register(func: Callable[[EconomyRecord], None]):
+        _MIGRATIONS[from_version] = func
+        return func
+    return register
+
+@migration(0)
+def _add_shop_inventory(data: EconomyRecord) -> None:
+    """v0 -> v1: shop inventory (equipped + owned cosmetics)."""
+    inv = data.setdefault("inventory", {})
+
+    # Equipped cosmetics
+    profile = inv.setdefault("profile", {})
+    profile.setdefault("frame", None)         # equipped frame_id (str) or None
+    profile.setdefault("accent_color", None)  # equipped color hex "#RRGGBB" or None
+
+    # Owned cosmetics
+    owned = inv.setdefault("owned", {})
+    owned.setdefault("frames", [])            # list[str]
+    owned.setdefault("colors", [])            # list[str] (hex "#RRGGBB")
+
+    data.mark_dirty("inventory")
+
+@migration(1)
+def _move_xp_bonus(data: EconomyRecord) -> None:
+    """v1 -> v2: an unexpired per-record xp_bonus moves into the boost table (utils/xp_boosts.py)."""
+    bonus = data.get("xp_bonus") or {}
+    if not bonus:
+        return
+
+    mult = float(bonus.get("multiplier", 1.0) or 1.0)
+    remaining = float(bonus.get("expires_at", 0) or 0) - time.time()
+    key = data.get("user_id")
+    # A boost granted with !xpboost since then wins over the old one
+    if key and mult > 1.0 and remaining > 0 and boosts.get(key) is None:
+        boosts.grant(key, mult, remaining)
+        print(f"[Economy] Moved x{mult:g} XP bonus of {key} to the boost table")
+    data["xp_bonus"] = {}
+
+def migrate_record(data: EconomyRecord) -> None:
+    """Runs every pending migration step on `data` (no-op when already current)."""
+    version = int(data.get("schema_version", 0) or 0)
+    while version < SCHEMA_VERSION:
+        _MIGRATIONS[version](data)
+        version += 1
+        data["schema_version"] = version
+
+class RecordCache:
+    """
+    Write-back LRU cache of EconomyRecord objects.
+    Reads and writes hit memory; dirty records are written to the store in
+    batches by flush() (timer thread + shutdown). Only clean records are evicted.
+
+    With a ledger, every committed change set is appended to it (O(1), buffered)
+    as part of the commit. The ledger fsyncs buffered entries in group commits
+    every ECONOMY_LEDGER_COMMIT_MS, so a crash can lose at most that last window.
+    flush() doubles as compaction: the flushed records are the new snapshot and
+    the rotated-out ledger segments are dropped.
+    """
+
+    def __init__(
+        self,
+        store: EconomyStore,
+        max_size: int,
+        on_load: Optional[Callable[[EconomyRecord], None]] = None,
+        ledger: Optional[EconomyLedger] = None,
+    ):
+        self.store = store
+        self.on_load = on_load
+        self.ledger = ledger
+        # Called as fn(key, record, changes, created) after every committed change (e.g. leaderboard index)
+        self.listeners: List[Callable[[str, EconomyRecord, list, bool], None]] = []
+        self.max_size = max(1, int(max_size))
+        self.lock = threading.RLock()
+        # Serializes store writes so an older snapshot never lands after a newer one
+        self._write_lock = threading.Lock()
+        self._records: "OrderedDict[str, EconomyRecord]" = OrderedDict()
+        self._dirty: Dict[str, int] = {}  # key -> change counter, cleared once written
+
+    def get(self, key: str) -> Optional[EconomyRecord]:
+        with self.lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records.move_to_end(key)
+                return record
+
+            data = self.store.load(key)
+            if data is None:
+                return None
+            record = EconomyRecord.from_dict(data)
+            if self.on_load is not None:
+                self.on_load(record)
+            self._insert(key, record)
+
+            # Upgraded on first load: persist the new shape once (re-runs after a crash)
+            if record.dirty:
+                record.clear_dirty()
+                self._touch(key)
+            return record
+
+    def put(self, key: str, data: EconomyRecord, created: bool = False) -> None:
+        """
+        Store `data` as the current record for `key`, journal its changes and mark
+        it dirty. `created` tells listeners this commit is a brand-new wallet.
+        """
+        with self.lock:
+            self._journal(key, data, created)
+            self._insert(key, data)
+            self._touch(key)
+
+    def commit(self, items: Iterable[Tuple[str, EconomyRecord]], write_through: bool) -> None:
+        """
+        Install several records at once. With write_through they are written to
+        the store immediately in a single save_many() batch.
+        """
+        items = list(items)
+        if not write_through:
+            with self.lock:
+                for key, data in items:
+                    self._journal(key, data)
+                    self._insert(key, data)
+                    self._touch(key)
+            return
+
+        with self._write_lock:
+            with self.lock:
+                for key, data in items:
+                    self._journal(key, data)
+                    self._insert(key, data)
+                    self._touch(key)
+                batch = self._capture([key for key, _ in items])
+            self._write(batch)
+
+    def _journal(self, key: str, data: EconomyRecord, created: bool = False) -> None:
+        changes = data.changes() if self.ledger is not None or self.listeners else []
+        if self.ledger is not None and changes:
+            data.stamp(self.ledger.append(key, changes))
+        data.clear_dirty()
+
+        for listener in self.listeners:
+            try:
+                listener(key, data, changes, created)
+            except Exception as e:
+                print(f"[Economy] Write listener failed: {e}")
+
+    def _touch(self, key: str) -> None:
+        self._dirty[key] = self._dirty.get(key, 0) + 1
+
+    def _insert(self, key: str, data: EconomyRecord) -> None:
+        self._records[key] = data
+        self._records.move_to_end(key)
+        if len(self._records) > self.max_size:
+            self._evict()
+
+    def _evict(self) -> None:
+        # Oldest clean records go first; dirty ones wait for the next flush
+        excess = len(self._records) - self.max_size
+        victims = []
+        for key in self._records:
+            if len(victims) >= excess:
+                break
+            if key not in self._dirty:
+                victims.append(key)
+        for key in victims:
+            del self._records[key]
+
+    def _capture(self, keys) -> list:
+        return [(key, self._dirty[key], self._records[key].to_dict()) for key in keys if key in self._dirty]
+
+    def _write(self, batch: list) -> None:
+        if not batch:
+            return
+        self.store.save_many((key, data) for key, _, data in batch)
+        with self.lock:
+            for key, version, _ in batch:
+                # Still dirty if it changed again while we were writing
+                if self._dirty.get(key) == version:
+                    del self._dirty[key]
+
+    def flush(self) -> int:
+        """Write every dirty record to the store in one batch. Returns the batch size."""
+        with self._write_lock:
+            with self.lock:
+                closed = self.ledger.rotate() if self.ledger is not None else []
+                batch = self._capture(list(self._dirty))
+            self._write(batch)
+
+        # Every entry in the closed segments is now part of the store snapshot
+        if closed:
+            self.ledger.discard(closed)
+        return len(batch)
+
+    def dirty_count(self) -> int:
+        with self.lock:
+            return len(self._dirty)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+# Storage backend (JSON folder or SQLite), picked by ECONOMY_BACKEND in config.py
+_store: EconomyStore = create_store(ECONOMY_BACKEND, ECONOMY_DB_PATH, ECONOMY_FOLDER)
+
+# Write-ahead ledger: replay whatever the last run did not snapshot, then start appending
+_ledger: Optional[EconomyLedger] = None
+if ECONOMY_LEDGER_ENABLED:
+    _ledger = EconomyLedger(ECONOMY_LEDGER_FOLDER, ECONOMY_LEDGER_COMMIT_MS)
+    _ledger.replay(_store)
+    _ledger.start()
+
+_cache = RecordCache(_store, ECONOMY_CACHE_SIZE, on_load=migrate_record, ledger=_ledger)
+
+# Bounded pool that runs storage work for the async API, off the event loop
+_io_pool = ThreadPoolExecutor(max_workers=ECONOMY_IO_WORKERS, thread_name_prefix="economy-io")
+
+# Per-member locks for read-modify-write; always acquired in sorted key order
+_user_locks: Dict[str, threading.RLock] = {}
+_user_locks_guard = threading.Lock()
+
+def _lock_for(key: str) -> threading.RLock:
+    with _user_locks_guard:
+        lock = _user_locks.get(key)
+        if lock is None:
+            lock = _user_locks[key] = threading.RLock()
+        return lock
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(ECONOMY_FLUSH_INTERVAL)
+        try:
+            flush_economy()
+        except Exception as e:
+            print(f"[Economy] Background flush failed: {e}")
+
+threading.Thread(target=_flush_loop, name="economy-flush", daemon=True).start()
+def _shutdown() -> None:
+    flush_economy()
+    if _ledger is not None:
+        _ledger.close()
+
+atexit.register(_shutdown)
 
 def _key_of(identity: EconomyIdentity) -> str:
     return identity if isinstance(identity, str) else user_key(identity)
@@ -25,82 +291,209 @@ def _key_of(identity: EconomyIdentity) -> str:
 def _member_of(identity: EconomyIdentity) -> Optional[discord.abc.User]:
     return identity if not isinstance(identity, str) else None
 
-def get_user_file(identity: EconomyIdentity) -> str:
-    key = _key_of(identity)
-    return os.path.join(ECONOMY_FOLDER, f"{key}.json")
+def get_store() -> EconomyStore:
+    return _store
 
-def load_economy(identity: EconomyIdentity) -> dict:
+def add_write_listener(listener: Callable[[str, EconomyRecord, list, bool], None]) -> None:
     """
-    Load a user's economy data.
-    If identity is a Member/User, refreshes username/display_name automatically.
+    Registers fn(user_id, record, changes, created), called (under the cache lock,
+    so keep it cheap) after every committed economy change. `changes` is
+    EconomyRecord.changes() of the commit (counter deltas / new values);
+    `created` is True only for the commit that creates a wallet (its changes
+    include the starting balance).
+    """
+    _cache.listeners.append(listener)
+
+def flush_economy() -> int:
+    """Persist all dirty cached records now. Returns how many were written."""
+    return _cache.flush()
+
+def load_economy(identity: EconomyIdentity) -> EconomyRecord:
+    """
+    Load a user's economy data (served from the in-memory cache when hot).
+    If identity is a Member/User, refreshes username/display_name automatically;
+    the record is only re-saved when something actually changed.
     """
     key = _key_of(identity)
     member = _member_of(identity)
 
-    path = get_user_file(key)
-    if os.path.exists(path):
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    else:
-        data = {
-            "user_id": key,
-            "username": None,
-            "display_name": None,
-            "currency": DEFAULT_CURRENCY_GIVE,
-            "bet_lock": 0,
-            "wordle_streak": 0,
-            "connect4_streak": 0,
-            "battleship_streak": 0,
-            "rolls": [],
-            "xp": 0,
-            "level": 1
-        }
-
-    # Always ensure canonical ID
-    data["user_id"] = key
-
-    # Auto-refresh labels when we have a member object
-    if member is not None:
-        data["username"] = getattr(member, "name", None)
-        data["display_name"] = getattr(member, "display_name", None)
-
-    save_economy(key, data)
+    with _cache.lock:
+        data = _cache.get(key)
+        created = data is None
+        if created:
+            # New wallet: persisted once so the starting balance sticks
+            data = EconomyRecord(key)
+            data.currency = DEFAULT_CURRENCY_GIVE
+            migrate_record(data)
+            data.mark_dirty()
+
+        # Always ensure canonical ID
+        data["user_id"] = key
+
+        # Auto-refresh labels when we have a member object
+        if member is not None:
+            data["username"] = getattr(member, "name", None)
+            data["display_name"] = getattr(member, "display_name", None)
+
+        if created:
+            _cache.put(key, data, created=True)
+        else:
+            save_economy(key, data)
     return data
 
-def save_economy(identity: EconomyIdentity, data: dict) -> None:
+def save_economy(identity: EconomyIdentity, data: Union[EconomyRecord, dict]) -> None:
+    """
+    Marks the record dirty in the cache; the disk write happens on the next flush.
+    Records without changed fields are skipped. Plain dicts are applied field by
+    field on top of the current record, so counters are journaled as real deltas.
+    """
     key = _key_of(identity)
-    with open(get_user_file(key), "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    if not isinstance(data, EconomyRecord):
+        with _lock_for(key):
+            current = _cache.get(key)
+            record = current.copy() if current is not None else EconomyRecord(key)
+            for field, value in data.items():
+                if field != "ledger_seq":  # bookkeeping, not a change
+                    record[field] = value
+            if record.dirty:
+                _cache.put(key, record)
+        return
+    if not data.dirty:
+        return
+    _cache.put(key, data)
 
-def add_currency(identity: EconomyIdentity, amount=DEFAULT_CURRENCY_GIVE) -> int:
-    data = load_economy(identity)
+@contextmanager
+def transaction(*identities: EconomyIdentity, write_through: bool = True):
+    """
+    Atomic update of one or more members:
+
+        with transaction(sender, receiver) as (src, dst):
+            withdraw(src, 50)
+            deposit(dst, 50)
+
+    Each record is loaded once and locked (fixed key order, so two transfers can't
+    deadlock). The block works on copies; if it raises, nothing is applied.
+    On success every record is committed together, written to disk in one
+    batch when write_through is True (left for the next flush otherwise).
+    Passing the same member twice yields the same record twice.
+    """
+    keys = [_key_of(identity) for identity in identities]
+    ordered = sorted(set(keys))
+    locks = [_lock_for(key) for key in ordered]
+
+    for lock in locks:
+        lock.acquire()
+    try:
+        working = {}
+        for identity, key in zip(identities, keys):
+            if key not in working:
+                working[key] = load_economy(identity).copy()
+
+        yield tuple(working[key] for key in keys)
+
+        # Only records the block actually changed are committed
+        changed = [(key, record) for key, record in working.items() if record.dirty]
+        if changed:
+            _cache.commit(changed, write_through=write_through)
+    finally:
+        for lock in reversed(locks):
+            lock.release()
+
+def deposit(data: EconomyRecord, amount: int) -> int:
+    """Adds currency to a record (use inside transaction()). Returns the new balance."""
     data["currency"] = int(data.get("currency", 0) or 0) + int(amount)
-    save_economy(data["user_id"], data)
     return data["currency"]
 
-def remove_currency(identity: EconomyIdentity, amount=DEFAULT_CURRENCY_TAKE) -> int:
-    data = load_economy(identity)
+def withdraw(data: EconomyRecord, amount: int, clamp: bool = False) -> int:
+    """
+    Removes currency from a record (use inside transaction()).
+    Raises InsufficientFunds if the balance is too low, unless clamp=True,
+    in which case the balance stops at 0. Returns the new balance.
+    """
     current = int(data.get("currency", 0) or 0)
+    if current < int(amount) and not clamp:
+        raise InsufficientFunds(f"{data.get('user_id')} has {current}, needs {amount}")
     data["currency"] = max(0, current - int(amount))
-    save_economy(data["user_id"], data)
     return data["currency"]
 
+def iter_economy() -> Iterator[Tuple[str, dict]]:
+    """
+    Yields (user_id, data) for every stored member. Read-only: nothing is re-saved.
+    """
+    flush_economy()
+    return _store.iter_all()
+
+def add_currency(identity: EconomyIdentity, amount=DEFAULT_CURRENCY_GIVE) -> int:
+    with transaction(identity, write_through=False) as (data,):
+        return deposit(data, amount)
+
+def remove_currency(identity: EconomyIdentity, amount=DEFAULT_CURRENCY_TAKE) -> int:
+    with transaction(identity, write_through=False) as (data,):
+        return withdraw(data, amount, clamp=True)
+
 def get_balance(identity: EconomyIdentity) -> int:
     return int(load_economy(identity).get("currency", 0) or 0)
 
 def add_xp(identity: EconomyIdentity, amount: int):
-    data = load_economy(identity)
-    data["xp"] = int(data.get("xp", 0) or 0) + int(amount)
-    data["level"] = int(data.get("level", 1) or 1)
+    with transaction(identity, write_through=False) as (data,):
+        old_level = int(data.get("level", 1) or 1)
+        # One bisect over the curve's thresholds, however many levels the award spans
+        data["level"], data["xp"] = curve.apply(old_level, int(data.get("xp", 0) or 0), amount)
+
+        leveled_up = data["level"] > old_level
+        reward = 0
+        if leveled_up:
+            # Paid for every level crossed, not just the last one
+            reward = level_up_reward(old_level, data["level"])
+            data["currency"] = int(data.get("currency", 0) or 0) + reward
+
+        return leveled_up, data["level"], reward
+
+# ---------- Async API (use these from cogs / coroutines) ----------
+
+async def run_io(func, *args, **kwargs):
+    """
+    Runs a blocking economy call on the economy I/O pool so the event loop
+    never waits on disk. Use for composite helpers without an a* variant.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_io_pool, functools.partial(func, *args, **kwargs))
+
+async def aload(identity: EconomyIdentity) -> EconomyRecord:
+    return await run_io(load_economy, identity)
+
+async def asave(identity: EconomyIdentity, data: Union[EconomyRecord, dict]) -> None:
+    await run_io(save_economy, identity, data)
+
+async def aadd_currency(identity: EconomyIdentity, amount=DEFAULT_CURRENCY_GIVE) -> int:
+    return await run_io(add_currency, identity, amount)
+
+async def aremove_currency(identity: EconomyIdentity, amount=DEFAULT_CURRENCY_TAKE) -> int:
+    return await run_io(remove_currency, identity, amount)
+
+async def aget_balance(identity: EconomyIdentity) -> int:
+    return await run_io(get_balance, identity)
+
+async def aadd_xp(identity: EconomyIdentity, amount: int):
+    return await run_io(add_xp, identity, amount)
+
+async def atransact(identities: Iterable[EconomyIdentity], mutate: Callable, write_through: bool = True):
+    """
+    Async transaction(): runs mutate(*records) inside transaction(*identities)
+    on the I/O pool and returns mutate's result. Exceptions raised by mutate
+    (e.g. InsufficientFunds) roll the transaction back and propagate.
+    """
+    identities = tuple(identities)
+
+    def _run():
+        with transaction(*identities, write_through=write_through) as records:
+            return mutate(*records)
 
-    leveled_up = False
-    while data["xp"] >= 100 * data["level"]:
-        data["xp"] -= 100 * data["level"]
-        data["level"] += 1
+    return await run_io(_run)
 
-        reward = int(LEVEL_UP_REWARD_MULTIPLIER * data["level"])
-        data["currency"] = int(data.get("currency", 0) or 0) + reward
-        leveled_up = True
+async def alist_economy() -> list:
+    """Async counterpart of iter_economy(); returns a list of (user_id, data)."""
+    return await run_io(lambda: list(iter_economy()))
 
-    save_economy(data["user_id"], data)
-    return leveled_up, data["level"]
+async def aflush() -> int:
+    return await run_io(flush_economy)
@@ -0,0 +1,221 @@
+# utils/economy_ledger.py
+import os
+import json
+import time
+import threading
+from collections import defaultdict
+from typing import Iterable, Iterator, List, Tuple
+
+from utils.economy_store import EconomyStore
+from utils.economy_record import EconomyRecord
+
+STATE_FILE = "state.json"
+SEGMENT_SUFFIX = ".log"
+
+class EconomyLedger:
+    """
+    Append-only write-ahead log of economy mutations.
+
+    Each committed change becomes one JSON line in the current segment file:
+        {"seq": 42, "uid": "1234", "field": "xp", "delta": 1, "ts": 1712345678.123}
+        {"seq": 43, "uid": "1234", "field": "inventory", "value": {...}, "ts": ...}
+
+    append() only buffers; a writer thread writes and fsyncs everything buffered
+    in one group commit every `group_commit_ms`. Compaction (see
+    utils.economy.flush_economy) writes the cached records to the store as the new
+    snapshot and then drops the rotated-out segments. On startup replay() folds
+    whatever is left into the store: an entry is applied only when its seq is newer
+    than the record's own `ledger_seq`, so replay is exact even after partial flushes.
+    """
+
+    def __init__(self, folder: str, group_commit_ms: int = 5):
+        self.folder = folder
+        self.interval = max(1, int(group_commit_ms)) / 1000.0
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.seq = self._read_state()
+        self._pending: List[str] = []
+        self._cond = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._file = None
+        self._segment_start = 0
+        self._closed = False
+
+        self._writer = threading.Thread(target=self._write_loop, name="economy-ledger", daemon=True)
+
+    # ---------- Segments / state ----------
+
+    def _state_path(self) -> str:
+        return os.path.join(self.folder, STATE_FILE)
+
+    def _read_state(self) -> int:
+        try:
+            with open(self._state_path(), "r", encoding="utf-8") as f:
+                return int(json.load(f).get("last_seq", 0))
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def _write_state(self) -> None:
+        tmp = self._state_path() + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"last_seq": self.seq}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._state_path())
+
+    def segments(self) -> List[str]:
+        """Segment paths, oldest first (named after their first sequence number)."""
+        names = [n for n in os.listdir(self.folder) if n.endswith(SEGMENT_SUFFIX)]
+        names.sort(key=lambda n: int(n[:-len(SEGMENT_SUFFIX)]))
+        return [os.path.join(self.folder, n) for n in names]
+
+    def _open_segment(self) -> None:
+        self._segment_start = self.seq + 1
+        path = os.path.join(self.folder, f"{self._segment_start}{SEGMENT_SUFFIX}")
+        self._file = open(path, "a", encoding="utf-8")
+
+    # ---------- Startup ----------
+
+    def replay(self, store: EconomyStore) -> int:
+        """
+        Applies every logged change newer than the stored records, saves the
+        result as one batch, deletes the old segments and starts a fresh one.
+        Returns the number of entries applied. Must run before start().
+        """
+        old_segments = self.segments()
+        by_uid = defaultdict(list)
+        for entry in self._read_entries(old_segments):
+            by_uid[entry["uid"]].append(entry)
+            self.seq = max(self.seq, int(entry["seq"]))
+
+        applied = 0
+        batch = []
+        for uid, entries in by_uid.items():
+            data = store.load(uid) or EconomyRecord(uid).to_dict()
+            last = int(data.get("ledger_seq", 0) or 0)
+            for entry in entries:
+                if entry["seq"] <= last:
+                    continue
+                field = entry["field"]
+                if "delta" in entry:
+                    data[field] = int(data.get(field, 0) or 0) + int(entry["delta"])
+                else:
+                    data[field] = entry.get("value")
+                data["ledger_seq"] = entry["seq"]
+                applied += 1
+            batch.append((uid, data))
+
+        if batch:
+            store.save_many(batch)
+        self._write_state()
+        for path in old_segments:
+            os.remove(path)
+
+        if applied:
+            print(f"[Economy] Replayed {applied} ledger entries for {len(by_uid)} members")
+        return applied
+
+    @staticmethod
+    def _read_entries(paths: Iterable[str]) -> Iterator[dict]:
+        for path in paths:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Torn final line from a crash mid-write: everything before it is intact
+                        print(f"[Economy] Ignoring damaged ledger line in {os.path.basename(path)}")
+                        break
+
+    def start(self) -> None:
+        self._open_segment()
+        self._writer.start()
+
+    # ---------- Appends / group commit ----------
+
+    def append(self, uid: str, changes: List[Tuple[str, str, object]]) -> int:
+        """
+        Buffers one committed change set for `uid` and returns its sequence number.
+        Callers must serialize appends with compaction (utils.economy holds the cache lock).
+        """
+        self.seq += 1
+        ts = round(time.time(), 3)
+        lines = []
+        for field, kind, value in changes:
+            entry = {"seq": self.seq, "uid": uid, "field": field, kind: value, "ts": ts}
+            lines.append(json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+        with self._cond:
+            self._pending.extend(lines)
+            self._cond.notify()
+        return self.seq
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if self._closed and not self._pending:
+                    return
+
+            # Let more appends pile up so they share one fsync
+            time.sleep(self.interval)
+            try:
+                self._commit_pending()
+            except Exception as e:
+                print(f"[Economy] Ledger group commit failed: {e}")
+
+    def _commit_pending(self) -> None:
+        with self._io_lock:
+            with self._cond:
+                lines, self._pending = self._pending, []
+            if not lines or self._file is None:
+                return
+            self._file.write("".join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def rotate(self) -> List[str]:
+        """
+        Closes the current segment (after committing its buffered entries) and
+        opens a new one. Returns the closed segments: every entry in them is
+        covered by a snapshot once the cache has been flushed.
+        """
+        with self._io_lock:
+            if self.seq < self._segment_start:
+                return []  # nothing appended since the last rotation
+
+            with self._cond:
+                lines, self._pending = self._pending, []
+            if self._file is not None:
+                if lines:
+                    self._file.write("".join(lines))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._file.close()
+
+            closed = self.segments()
+            self._write_state()
+            self._open_segment()
+        return closed
+
+    def discard(self, segments: Iterable[str]) -> None:
+        for path in segments:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        self._commit_pending()
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
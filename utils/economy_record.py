@@ -0,0 +1,189 @@
+# utils/economy_record.py
+import copy
+from typing import Any, Iterator, Optional, Tuple
+
+# Fixed economy fields, in the order they are written to disk
+RECORD_FIELDS = (
+    "schema_version",
+    "user_id",
+    "username",
+    "display_name",
+    "currency",
+    "bet_lock",
+    "wordle_streak",
+    "connect4_streak",
+    "battleship_streak",
+    "rolls",
+    "xp",
+    "level",
+    "inventory",
+    "xp_bonus",
+    "ledger_seq",
+)
+
+# Numeric fields journaled as deltas; every other field is journaled by value
+COUNTER_FIELDS = frozenset({
+    "currency",
+    "xp",
+    "level",
+    "wordle_streak",
+    "connect4_streak",
+    "battleship_streak",
+})
+
+# Defaults for a record that has never been saved (containers are copied per record)
+RECORD_DEFAULTS = {
+    "schema_version": 0,   # records saved before versioning are version 0
+    "user_id": None,
+    "username": None,
+    "display_name": None,
+    "currency": 0,
+    "bet_lock": 0,
+    "wordle_streak": 0,
+    "connect4_streak": 0,
+    "battleship_streak": 0,
+    "rolls": [],
+    "xp": 0,
+    "level": 1,
+    "inventory": {},
+    "xp_bonus": {},        # legacy: moved to the boost table (utils/xp_boosts.py) by the v2 migration
+    "ledger_seq": 0,       # last economy ledger entry already applied to this record
+}
+
+_MISSING = object()
+
+class EconomyRecord:
+    """
+    One member's economy data.
+
+    Fixed fields are slots; unknown keys from older or hand-edited files are kept
+    in `extra` so nothing is lost on save. Supports the dict-style access the cogs
+    already use (data["currency"], data.get(...), data.setdefault(...)).
+
+    Every assignment that actually changes a value is recorded in `dirty_fields`
+    (together with the value it had before, see changes());
+    save_economy()/transaction() skip persistence when nothing changed.
+    In-place edits of nested containers (inventory, rolls, xp_bonus) are not seen
+    automatically: call mark_dirty("inventory") after mutating them.
+    """
+
+    __slots__ = RECORD_FIELDS + ("extra", "_dirty")
+
+    def __init__(self, user_id: Optional[str] = None):
+        for field in RECORD_FIELDS:
+            object.__setattr__(self, field, copy.copy(RECORD_DEFAULTS[field]))
+        object.__setattr__(self, "user_id", user_id)
+        object.__setattr__(self, "extra", {})
+        object.__setattr__(self, "_dirty", {})  # field -> value before the first change
+
+    # ---------- Construction / serialization ----------
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EconomyRecord":
+        """Builds a clean (not dirty) record from a stored dict."""
+        record = cls()
+        for key, value in data.items():
+            if key in RECORD_FIELDS:
+                object.__setattr__(record, key, value)
+            else:
+                record.extra[key] = value
+        return record
+
+    def to_dict(self) -> dict:
+        """Returns an independent plain dict suitable for a storage backend."""
+        data = {field: copy.deepcopy(getattr(self, field)) for field in RECORD_FIELDS}
+        data.update(copy.deepcopy(self.extra))
+        return data
+
+    def copy(self) -> "EconomyRecord":
+        """Deep copy, including the current dirty fields."""
+        clone = EconomyRecord.from_dict(self.to_dict())
+        clone._dirty.update(self._dirty)
+        return clone
+
+    # ---------- Dirty tracking ----------
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty)
+
+    @property
+    def dirty_fields(self) -> frozenset:
+        return frozenset(self._dirty)
+
+    def mark_dirty(self, *fields: str) -> None:
+        """Flags fields as changed (all fields when called without arguments)."""
+        for field in fields or RECORD_FIELDS:
+            self._dirty.setdefault(field, copy.deepcopy(self.get(field)))
+
+    def clear_dirty(self) -> None:
+        self._dirty.clear()
+
+    def changes(self) -> list:
+        """
+        Compact description of the pending changes:
+        [(field, "delta", n)] for counters, [(field, "value", v)] for everything else.
+        """
+        out = []
+        for field, before in self._dirty.items():
+            after = self.get(field)
+            if field in COUNTER_FIELDS and isinstance(before, int) and isinstance(after, int):
+                if after != before:
+                    out.append((field, "delta", after - before))
+            else:
+                out.append((field, "value", copy.deepcopy(after)))
+        return out
+
+    def stamp(self, seq: int) -> None:
+        """Records the ledger sequence number this record now includes (not a tracked change)."""
+        object.__setattr__(self, "ledger_seq", seq)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name not in RECORD_FIELDS:
+            raise AttributeError(f"EconomyRecord has no field '{name}'")
+        current = getattr(self, name)
+        # Re-assigning the same container counts as a change (it was likely edited in place)
+        if current is value and not isinstance(value, (dict, list)):
+            return
+        if current is not value and current == value and type(current) is type(value):
+            return
+        self._dirty.setdefault(name, current)
+        object.__setattr__(self, name, value)
+
+    # ---------- dict-style access ----------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in RECORD_FIELDS:
+            return getattr(self, key)
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in RECORD_FIELDS:
+            setattr(self, key, value)
+        elif self.extra.get(key, _MISSING) != value:
+            self._dirty.setdefault(key, self.extra.get(key))
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in RECORD_FIELDS or key in self.extra
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in RECORD_FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def keys(self) -> Iterator[str]:
+        yield from RECORD_FIELDS
+        yield from self.extra
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self.keys():
+            yield key, self[key]
+
+    def __repr__(self) -> str:
+        return f"EconomyRecord({self.user_id!r}, currency={self.currency}, level={self.level}, xp={self.xp})"
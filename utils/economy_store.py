@@ -0,0 +1,306 @@
+# utils/economy_store.py
+import os
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from config import ECONOMY_FOLDER
+
+# Columns the SQLite backend keeps as real (indexed) columns. Everything else
+# in a record (rolls, inventory, xp_bonus, ...) lives in the JSON "extra" column.
+COLUMN_FIELDS = (
+    "username",
+    "display_name",
+    "currency",
+    "xp",
+    "level",
+    "bet_lock",
+    "wordle_streak",
+    "connect4_streak",
+    "battleship_streak",
+)
+
+# Fields leaderboards rank by (kept per member by utils.leaderboard_index)
+SUMMARY_FIELDS = (
+    "level",
+    "xp",
+    "currency",
+    "wordle_streak",
+    "connect4_streak",
+    "battleship_streak",
+)
+
+# (mtime_ns or None, summary) per member, as returned by scan_summaries()
+Summaries = Dict[str, Tuple[Optional[int], dict]]
+
+def summarize(data) -> dict:
+    """Leaderboard summary of a record (dict or EconomyRecord)."""
+    summary = {field: int(data.get(field, 0) or 0) for field in SUMMARY_FIELDS}
+    summary["level"] = summary["level"] or 1
+    return summary
+
+class EconomyStore(ABC):
+    """
+    Storage backend for economy records.
+    Records are plain dicts keyed by the member's user ID (str).
+    A backend missing one of the abstract methods fails when it is constructed.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[dict]:
+        ...
+
+    def save(self, key: str, data: dict) -> None:
+        self.save_many([(key, data)])
+
+    @abstractmethod
+    def save_many(self, items: Iterable[Tuple[str, dict]]) -> None:
+        ...
+
+    @abstractmethod
+    def iter_all(self) -> Iterator[Tuple[str, dict]]:
+        ...
+
+    def count(self) -> int:
+        return sum(1 for _ in self.iter_all())
+
+    def scan_summaries(self, known: Optional[Summaries] = None) -> Summaries:
+        """
+        Leaderboard summaries for every member. `known` is a previous scan that
+        backends may reuse for records that have not changed since.
+        """
+        return {key: (None, summarize(data)) for key, data in self.iter_all()}
+
+    def close(self) -> None:
+        pass
+
+
+class JsonFolderStore(EconomyStore):
+    """One pretty-printed <user_id>.json file per member (the original layout)."""
+
+    def __init__(self, folder: str = ECONOMY_FOLDER):
+        self.folder = folder
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.folder, f"{key}.json")
+
+    def load(self, key: str) -> Optional[dict]:
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_many(self, items: Iterable[Tuple[str, dict]]) -> None:
+        for key, data in items:
+            with open(self.path_for(key), "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=4, ensure_ascii=False)
+
+    def iter_all(self) -> Iterator[Tuple[str, dict]]:
+        for filename in os.listdir(self.folder):
+            if not filename.endswith(".json"):
+                continue
+
+            key = filename[:-5]  # strip ".json"
+            if not key.isdigit():
+                continue
+
+            try:
+                with open(os.path.join(self.folder, filename), "r", encoding="utf-8") as f:
+                    yield key, json.load(f)
+            except Exception as e:
+                print(f"[Economy] Skipping unreadable file {filename}: {e}")
+
+    def scan_summaries(self, known: Optional[Summaries] = None) -> Summaries:
+        """Only files whose mtime changed since `known` are parsed again."""
+        known = known or {}
+        out = {}
+        for entry in os.scandir(self.folder):
+            if not entry.name.endswith(".json"):
+                continue
+            key = entry.name[:-5]
+            if not key.isdigit():
+                continue
+
+            mtime = entry.stat().st_mtime_ns
+            previous = known.get(key)
+            if previous is not None and previous[0] == mtime:
+                out[key] = previous
+                continue
+
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    out[key] = (mtime, summarize(json.load(f)))
+            except Exception as e:
+                print(f"[Economy] Skipping unreadable file {entry.name}: {e}")
+        return out
+
+    def mtime_of(self, key: str) -> Optional[int]:
+        try:
+            return os.stat(self.path_for(key)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+
+class SqliteStore(EconomyStore):
+    """
+    Single SQLite database (WAL mode). Hot fields are real columns with indexes
+    so leaderboards can be answered with ORDER BY ... LIMIT instead of a folder scan.
+    """
+
+    def __init__(self, path: str):
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS economy (
+                    user_id TEXT PRIMARY KEY,
+                    username TEXT,
+                    display_name TEXT,
+                    currency INTEGER NOT NULL DEFAULT 0,
+                    xp INTEGER NOT NULL DEFAULT 0,
+                    level INTEGER NOT NULL DEFAULT 1,
+                    bet_lock INTEGER NOT NULL DEFAULT 0,
+                    wordle_streak INTEGER NOT NULL DEFAULT 0,
+                    connect4_streak INTEGER NOT NULL DEFAULT 0,
+                    battleship_streak INTEGER NOT NULL DEFAULT 0,
+                    extra TEXT NOT NULL DEFAULT '{}'
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_economy_currency ON economy (currency)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_economy_level_xp ON economy (level, xp)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_economy_wordle ON economy (wordle_streak)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_economy_connect4 ON economy (connect4_streak)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_economy_battleship ON economy (battleship_streak)")
+
+    @staticmethod
+    def _to_row(key: str, data: dict) -> tuple:
+        extra = {k: v for k, v in data.items() if k not in COLUMN_FIELDS and k != "user_id"}
+        return (
+            key,
+            data.get("username"),
+            data.get("display_name"),
+            int(data.get("currency", 0) or 0),
+            int(data.get("xp", 0) or 0),
+            int(data.get("level", 1) or 1),
+            int(data.get("bet_lock", 0) or 0),
+            int(data.get("wordle_streak", 0) or 0),
+            int(data.get("connect4_streak", 0) or 0),
+            int(data.get("battleship_streak", 0) or 0),
+            json.dumps(extra, ensure_ascii=False),
+        )
+
+    @staticmethod
+    def _from_row(row: tuple) -> dict:
+        data = {"user_id": row[0]}
+        data.update(zip(COLUMN_FIELDS, row[1:10]))
+        data.update(json.loads(row[10] or "{}"))
+        return data
+
+    def load(self, key: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT user_id, {', '.join(COLUMN_FIELDS)}, extra FROM economy WHERE user_id = ?",
+                (key,),
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def save_many(self, items: Iterable[Tuple[str, dict]]) -> None:
+        rows = [self._to_row(key, data) for key, data in items]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO economy (user_id, {', '.join(COLUMN_FIELDS)}, extra) "
+                f"VALUES ({', '.join('?' * (len(COLUMN_FIELDS) + 2))})",
+                rows,
+            )
+
+    def iter_all(self) -> Iterator[Tuple[str, dict]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT user_id, {', '.join(COLUMN_FIELDS)}, extra FROM economy"
+            ).fetchall()
+        for row in rows:
+            yield row[0], self._from_row(row)
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM economy").fetchone()[0]
+
+    def scan_summaries(self, known: Optional[Summaries] = None) -> Summaries:
+        """Reads only the indexed columns; no JSON decoding."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT user_id, {', '.join(SUMMARY_FIELDS)} FROM economy"
+            ).fetchall()
+        return {row[0]: (None, dict(zip(SUMMARY_FIELDS, row[1:]))) for row in rows}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def import_json_folder(store: EconomyStore, folder: str = ECONOMY_FOLDER) -> int:
+    """
+    Bulk-load every <user_id>.json file from `folder` into `store`.
+    All records are written in a single save_many() call (one transaction on SQLite).
+    Returns the number of imported records.
+    """
+    if not os.path.isdir(folder):
+        return 0
+
+    records = []
+    for key, data in JsonFolderStore(folder).iter_all():
+        data["user_id"] = key
+        records.append((key, data))
+
+    store.save_many(records)
+    return len(records)
+
+
+def create_store(backend: str, db_path: str, folder: str = ECONOMY_FOLDER) -> EconomyStore:
+    """
+    Build the configured backend. A fresh SQLite database is seeded once from
+    the existing JSON folder so switching backends does not lose anyone's wallet.
+    """
+    backend = (backend or "json").lower()
+
+    if backend == "json":
+        return JsonFolderStore(folder)
+
+    if backend == "sqlite":
+        store = SqliteStore(db_path)
+        if store.count() == 0:
+            imported = import_json_folder(store, folder)
+            if imported:
+                print(f"[Economy] Imported {imported} records from {folder} into {db_path}")
+        return store
+
+    raise ValueError(f"Unknown ECONOMY_BACKEND '{backend}' (expected 'json' or 'sqlite')")
+
+
+if __name__ == "__main__":
+    # Manual import: python -m utils.economy_store [db_path]
+    import sys
+    from config import ECONOMY_DB_PATH
+
+    target = SqliteStore(sys.argv[1] if len(sys.argv) > 1 else ECONOMY_DB_PATH)
+    print(f"Imported {import_json_folder(target)} records into {target.path}")
+    target.close()
@@ -0,0 +1,112 @@
+# utils/frame_assets.py
+import os
+import time
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+PROFILE_FRAMES_DIR = os.path.join("data", "profile_frames")
+FRAME_RESCAN_SECONDS = 30  # how often the folder is re-listed to notice added/changed/removed frames
+
+Size = Tuple[int, int]
+
+class FrameAssets:
+    """
+    Registry of profile frames in PROFILE_FRAMES_DIR.
+
+    The folder is listed once (then at most every FRAME_RESCAN_SECONDS), each
+    frame is decoded to RGBA once, and resized variants are kept per requested
+    size (512x512 card, 256x256 thumbnail, ...). A frame is only decoded again
+    when its mtime changes. Returned images are shared: composite them, never
+    draw on them.
+    """
+
+    def __init__(self, folder: str = PROFILE_FRAMES_DIR):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._mtimes: Dict[str, int] = {}                     # frame_id -> mtime_ns of the listed file
+        self._images: Dict[str, Image.Image] = {}              # frame_id -> decoded original
+        self._variants: Dict[Tuple[str, Size], Image.Image] = {}
+        self._scanned_at = None
+
+    def _rescan(self) -> None:
+        mtimes = {}
+        try:
+            with os.scandir(self.folder) as entries:
+                for entry in entries:
+                    if entry.name.lower().endswith(".png") and entry.is_file():
+                        mtimes[entry.name[:-4]] = entry.stat().st_mtime_ns
+        except FileNotFoundError:
+            pass
+
+        # Drop decoded frames that were removed or changed on disk
+        for frame_id in list(self._images):
+            if mtimes.get(frame_id) != self._mtimes.get(frame_id):
+                self._forget(frame_id)
+        self._mtimes = mtimes
+        self._scanned_at = time.monotonic()
+
+    def _maybe_rescan(self) -> None:
+        if self._scanned_at is None or time.monotonic() - self._scanned_at > FRAME_RESCAN_SECONDS:
+            self._rescan()
+
+    def _forget(self, frame_id: str) -> None:
+        self._images.pop(frame_id, None)
+        for key in [k for k in self._variants if k[0] == frame_id]:
+            del self._variants[key]
+
+    def refresh(self) -> None:
+        """Re-lists the folder now (e.g. right after adding a frame)."""
+        with self._lock:
+            self._rescan()
+
+    def exists(self, frame_id: str) -> bool:
+        with self._lock:
+            self._maybe_rescan()
+            return frame_id in self._mtimes
+
+    def ids(self) -> List[str]:
+        """Every frame currently in the folder."""
+        with self._lock:
+            self._maybe_rescan()
+            return sorted(self._mtimes)
+
+    def version(self, frame_id: Optional[str]) -> int:
+        """mtime of the frame file (0 if missing); changes whenever the PNG is replaced."""
+        if not frame_id:
+            return 0
+        with self._lock:
+            self._maybe_rescan()
+            return self._mtimes.get(frame_id, 0)
+
+    def get(self, frame_id: Optional[str], size: Size) -> Optional[Image.Image]:
+        """RGBA frame resized to `size`, or None if there is no such (readable) frame."""
+        if not frame_id:
+            return None
+        size = (int(size[0]), int(size[1]))
+        with self._lock:
+            self._maybe_rescan()
+            if frame_id not in self._mtimes:
+                return None
+
+            variant = self._variants.get((frame_id, size))
+            if variant is not None:
+                return variant
+
+            image = self._images.get(frame_id)
+            if image is None:
+                try:
+                    with Image.open(os.path.join(self.folder, f"{frame_id}.png")) as f:
+                        image = f.convert("RGBA")
+                except Exception as e:
+                    print(f"[Frames] Failed to load frame '{frame_id}': {e}")
+                    return None
+                self._images[frame_id] = image
+
+            variant = image if image.size == size else image.resize(size, Image.Resampling.LANCZOS)
+            self._variants[(frame_id, size)] = variant
+            return variant
+
+
+frame_assets = FrameAssets()
@@ -0,0 +1,187 @@
+# utils/leaderboard_index.py
+import os
+import json
+import atexit
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from utils import economy
+from utils.economy_record import EconomyRecord
+from utils.economy_store import JsonFolderStore, Summaries, summarize
+
+INDEX_SNAPSHOT_FILE = os.path.join("data", "leaderboard_index.json")
+
+# Board name -> summary fields it is ordered by (highest first)
+BOARDS = {
+    "level": ("level", "xp"),
+    "currency": ("currency",),
+    "wordle": ("wordle_streak",),
+    "connect4": ("connect4_streak",),
+    "battleship": ("battleship_streak",),
+}
+
+class RankingIndex:
+    """
+    In-memory leaderboards. Each board is a list kept sorted by
+    (negated score..., user_id), so the top k is a slice and a member's entry is
+    found with bisect. Built once from the store, then kept current by an
+    economy write listener instead of re-reading every record per command.
+    """
+
+    def __init__(self, snapshot_path: str = INDEX_SNAPSHOT_FILE):
+        self.snapshot_path = snapshot_path
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()  # held for the whole build; later callers wait on it
+        self._summaries: Dict[str, dict] = {}
+        self._sorted: Dict[str, list] = {board: [] for board in BOARDS}
+        self._built = False
+        self._building = False
+        self._touched = set()  # members written while a build was scanning
+
+    @staticmethod
+    def _entry(board: str, uid: str, summary: dict) -> tuple:
+        return tuple(-summary[field] for field in BOARDS[board]) + (uid,)
+
+    def _set(self, uid: str, summary: dict) -> None:
+        old = self._summaries.get(uid)
+        if old == summary:
+            return
+        for board, entries in self._sorted.items():
+            if old is not None:
+                i = bisect_left(entries, self._entry(board, uid, old))
+                if i < len(entries) and entries[i][-1] == uid:
+                    del entries[i]
+            insort(entries, self._entry(board, uid, summary))
+        self._summaries[uid] = summary
+
+    # ---------- Build / snapshot ----------
+
+    def ensure_built(self) -> None:
+        """
+        Builds the index on first call (blocking: run it on the economy I/O pool).
+        Callers arriving during a build wait for it instead of reading a half-empty index.
+        """
+        if self._built:
+            return
+        with self._build_lock:
+            if self._built:
+                return  # built by the caller we waited on
+            with self._lock:
+                self._building = True
+                self._touched.clear()
+
+            try:
+                # Cached changes must be on disk before the scan, the listener covers the rest
+                economy.flush_economy()
+                scanned = economy.get_store().scan_summaries(self._load_snapshot())
+            except Exception:
+                with self._lock:
+                    self._building = False
+                raise
+
+            with self._lock:
+                for uid, (_, summary) in scanned.items():
+                    if uid not in self._touched:
+                        self._set(uid, summary)
+                self._built = True
+                self._building = False
+                self._touched.clear()
+        self._save_snapshot(scanned)
+
+    def _load_snapshot(self) -> Summaries:
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return {}
+        return {uid: (entry[0], entry[1]) for uid, entry in raw.items()}
+
+    def _save_snapshot(self, scanned: Optional[Summaries] = None) -> None:
+        """
+        Persists (mtime, summary) per member so the next startup only parses
+        files that changed in between (including edits made outside the bot).
+        """
+        store = economy.get_store()
+        if not isinstance(store, JsonFolderStore):
+            return  # SQLite scans read indexed columns only; nothing to reuse
+
+        if scanned is None:
+            with self._lock:
+                summaries = dict(self._summaries)
+            scanned = {uid: (store.mtime_of(uid), summary) for uid, summary in summaries.items()}
+
+        tmp = self.snapshot_path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({uid: [mtime, summary] for uid, (mtime, summary) in scanned.items() if mtime}, f)
+            os.replace(tmp, self.snapshot_path)
+        except OSError as e:
+            print(f"[Leaderboard] Failed to save index snapshot: {e}")
+
+    def shutdown(self) -> None:
+        """Flushes the economy and saves the snapshot with the final file mtimes."""
+        if not self._built:
+            return
+        economy.flush_economy()
+        self._save_snapshot()
+
+    # ---------- Updates ----------
+
+    def on_write(self, uid: str, record: EconomyRecord, changes: list, created: bool) -> None:
+        """Economy write listener: O(log n) search + list insert per board."""
+        with self._lock:
+            if self._building:
+                self._touched.add(uid)
+            self._set(uid, summarize(record))
+
+    # ---------- Queries ----------
+
+    def top(self, board: str, k: int = 10, offset: int = 0) -> List[Tuple[str, dict]]:
+        """[(user_id, summary)] for ranks offset+1 .. offset+k of `board`."""
+        with self._lock:
+            entries = self._sorted[board][offset:offset + k]
+            return [(entry[-1], self._summaries[entry[-1]]) for entry in entries]
+
+    def rank(self, board: str, uid: str) -> Optional[int]:
+        """
+        1-based position of `uid` on `board` (members with equal scores share a
+        rank), or None if the member has no record. O(log n).
+        """
+        with self._lock:
+            summary = self._summaries.get(uid)
+            if summary is None:
+                return None
+            # The score prefix sorts before every (score..., uid) entry with that score
+            scores = self._entry(board, uid, summary)[:-1]
+            return bisect_left(self._sorted[board], scores) + 1
+
+    def ranks(self, uid: str) -> Dict[str, Optional[int]]:
+        return {board: self.rank(board, uid) for board in BOARDS}
+
+    def summary(self, uid: str) -> Optional[dict]:
+        with self._lock:
+            return self._summaries.get(uid)
+
+    def __len__(self) -> int:
+        return len(self._summaries)
+
+
+ranking = RankingIndex()
+economy.add_write_listener(ranking.on_write)
+atexit.register(ranking.shutdown)
+
+
+async def aensure_built() -> None:
+    """Builds the shared index on the economy I/O pool (no-op once built)."""
+    await economy.run_io(ranking.ensure_built)
+
+
+async def atop(board: str, k: int = 10, offset: int = 0) -> List[Tuple[str, dict]]:
+    await aensure_built()
+    return ranking.top(board, k, offset)
+
+
+async def aranks(uid: str) -> Dict[str, Optional[int]]:
+    await aensure_built()
+    return ranking.ranks(uid)
@@ -1,7 +1,75 @@
+import asyncio
 import aiohttp
+from typing import Optional
 from config import OPENWEBUI_API_KEY, OPENWEBUI_API_URL, MODEL_NAME, BOT_NAME, COMMAND_PREFIX
+from config import (
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_CONNECTIONS_PER_HOST,
+    LLM_DNS_CACHE_SECONDS,
+    LLM_KEEPALIVE_SECONDS,
+    LLM_REQUEST_TIMEOUT,
+)
 import json
 
+class LLMClient:
+    """
+    Long-lived connection pool to OpenWebUI shared by every LLM request.
+
+    The bot opens it in setup_hook and closes it on shutdown, so `!ask`, dice
+    reactions and help questions reuse kept-alive connections (and a cached
+    DNS lookup) instead of opening a new TCP/TLS connection each time.
+    """
+
+    def __init__(
+        self,
+        limit: int = LLM_MAX_CONNECTIONS,
+        limit_per_host: int = LLM_MAX_CONNECTIONS_PER_HOST,
+        dns_cache_seconds: int = LLM_DNS_CACHE_SECONDS,
+        keepalive_seconds: float = LLM_KEEPALIVE_SECONDS,
+        timeout_seconds: float = LLM_REQUEST_TIMEOUT,
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_seconds = dns_cache_seconds
+        self.keepalive_seconds = keepalive_seconds
+        self.timeout_seconds = timeout_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None and not self._session.closed
+
+    async def start(self) -> None:
+        """Opens the pooled session (called from the bot's setup_hook)."""
+        if self.started:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_seconds,
+            keepalive_timeout=self.keepalive_seconds,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+        )
+
+    async def session(self) -> aiohttp.ClientSession:
+        # Opened on first use as well, so scripts without the bot still work
+        if not self.started:
+            await self.start()
+        return self._session
+
+    async def close(self) -> None:
+        """Closes pooled connections (called when the bot shuts down)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+llm_client = LLMClient()
+
 async def query_llm(ctx, prompt, private_channel=None):
     """Send a request to the LLM API and return the generated response."""
     if not OPENWEBUI_API_URL or not OPENWEBUI_API_KEY:
@@ -22,18 +90,20 @@ async def query_llm(ctx, prompt, private_channel=None):
         }
 
         try:
-            # Open session for making the request
-            async with aiohttp.ClientSession() as session:
-                async with session.post(OPENWEBUI_API_URL, json=data, headers=headers) as response:
-                    # Check response status
-                    if response.status == 200:
-                        json_data = await response.json()
-                        response_text = json_data.get("choices", [{}])[0].get("message", {}).get("content", "No response generated.")
-                        return response_text
-                    else:
-                        return f"API Error: {response.status} - {response.text()}"
+            # Reuse a pooled connection for the request
+            session = await llm_client.session()
+            async with session.post(OPENWEBUI_API_URL, json=data, headers=headers) as response:
+                # Check response status
+                if response.status == 200:
+                    json_data = await response.json()
+                    response_text = json_data.get("choices", [{}])[0].get("message", {}).get("content", "No response generated.")
+                    return response_text
+                else:
+                    return f"API Error: {response.status} - {await response.text()}"
         except aiohttp.ClientError as e:
             return f"Request Failed: {e}"
+        except asyncio.TimeoutError:
+            return f"Request Failed: no response within {llm_client.timeout_seconds} seconds."
         except json.JSONDecodeError:
             return "Error: Failed to decode the response from the API."
         except Exception as e:
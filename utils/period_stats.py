@@ -0,0 +1,166 @@
+# utils/period_stats.py
+import os
+import json
+import time
+import atexit
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import ECONOMY_FLUSH_INTERVAL
+from utils import economy
+from utils.economy_record import EconomyRecord
+
+PERIOD_STATS_FILE = os.path.join("data", "period_stats.json")
+
+# Period name -> number of daily buckets it sums (today included)
+PERIODS = {
+    "day": 1,
+    "week": 7,
+    "month": 30,
+}
+
+RETENTION_DAYS = max(PERIODS.values())
+
+# Index of each tracked value in a bucket entry
+FIELDS = ("xp", "currency")
+
+def today() -> int:
+    """UTC day number buckets are keyed by."""
+    return datetime.now(timezone.utc).date().toordinal()
+
+class PeriodStats:
+    """
+    Per-member, per-UTC-day XP earned and net currency change.
+
+    Buckets are {day: {user_id: [xp, currency]}}, so a period total is the sum of
+    at most RETENTION_DAYS small dicts and nothing ever rescans raw events.
+    Buckets older than the longest period are pruned. Totals per period are
+    cached until the next recorded change or day rollover.
+    """
+
+    def __init__(self, path: str = PERIOD_STATS_FILE):
+        self.path = path
+        self._lock = threading.RLock()
+        self._buckets: Dict[int, Dict[str, List[int]]] = {}
+        self._rollups: Dict[Tuple[str, int], Dict[str, List[int]]] = {}
+        self._sorted: Dict[Tuple[str, int, str], List[str]] = {}
+        self._dirty = False
+        self._load()
+
+    # ---------- Persistence ----------
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        self._buckets = {int(day): members for day, members in raw.items()}
+        self._prune(today())
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {str(day): {uid: list(v) for uid, v in members.items()} for day, members in self._buckets.items()}
+            self._dirty = False
+
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            with self._lock:
+                self._dirty = True
+            print(f"[Leaderboard] Failed to save period stats: {e}")
+
+    def _prune(self, day: int) -> None:
+        for old in [d for d in self._buckets if d <= day - RETENTION_DAYS]:
+            del self._buckets[old]
+            self._dirty = True
+
+    # ---------- Recording ----------
+
+    def record(self, uid: str, xp: int = 0, currency: int = 0) -> None:
+        if not xp and not currency:
+            return
+        day = today()
+        with self._lock:
+            if day not in self._buckets:
+                self._prune(day)
+            entry = self._buckets.setdefault(day, {}).setdefault(uid, [0, 0])
+            entry[0] += int(xp)
+            entry[1] += int(currency)
+            self._rollups.clear()
+            self._sorted.clear()
+            self._dirty = True
+
+    def on_write(self, uid: str, record: EconomyRecord, changes: list, created: bool) -> None:
+        """Economy write listener: net currency change of every commit (a new wallet's starting balance isn't earned)."""
+        if created:
+            return
+        for field, kind, value in changes:
+            if field == "currency" and kind == "delta":
+                self.record(uid, currency=value)
+
+    # ---------- Queries ----------
+
+    def totals(self, period: str) -> Dict[str, List[int]]:
+        """{user_id: [xp, currency]} summed over the buckets of `period`."""
+        day = today()
+        key = (period, day)
+        with self._lock:
+            cached = self._rollups.get(key)
+            if cached is not None:
+                return cached
+
+            out: Dict[str, List[int]] = {}
+            for d in range(day - PERIODS[period] + 1, day + 1):
+                for uid, (xp, currency) in self._buckets.get(d, {}).items():
+                    entry = out.setdefault(uid, [0, 0])
+                    entry[0] += xp
+                    entry[1] += currency
+            self._rollups = {k: v for k, v in self._rollups.items() if k[1] == day}
+            self._rollups[key] = out
+            return out
+
+    def _ordered(self, period: str, field: str) -> List[str]:
+        totals = self.totals(period)
+        i = FIELDS.index(field)
+        key = (period, today(), field)
+        with self._lock:
+            order = self._sorted.get(key)
+            if order is None:
+                order = [uid for uid, v in totals.items() if v[i] > 0]
+                order.sort(key=lambda uid: (-totals[uid][i], uid))
+                self._sorted[key] = order
+            return order
+
+    def top(self, period: str, field: str = "xp", k: int = 10, offset: int = 0) -> List[Tuple[str, int, int]]:
+        """[(user_id, xp, currency)] ranked by `field` gained during `period` (positive only)."""
+        with self._lock:
+            totals = self.totals(period)
+            return [(uid, *totals[uid]) for uid in self._ordered(period, field)[offset:offset + k]]
+
+    def count(self, period: str, field: str = "xp") -> int:
+        return len(self._ordered(period, field))
+
+    def get(self, period: str, uid: str) -> Optional[List[int]]:
+        return self.totals(period).get(uid)
+
+
+period_stats = PeriodStats()
+economy.add_write_listener(period_stats.on_write)
+atexit.register(period_stats.save)
+
+def _save_loop() -> None:
+    while True:
+        time.sleep(ECONOMY_FLUSH_INTERVAL)
+        period_stats.save()
+
+threading.Thread(target=_save_loop, name="period-stats-save", daemon=True).start()
+
+async def atop(period: str, field: str = "xp", k: int = 10, offset: int = 0) -> List[Tuple[str, int, int]]:
+    return await economy.run_io(period_stats.top, period, field, k, offset)
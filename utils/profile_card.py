@@ -1,17 +1,26 @@
 # utils/profile_card.py
-import os
-from io import BytesIO
-from typing import Optional, Tuple
+import functools
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
 
 import discord
-from PIL import Image, ImageDraw
+from PIL import Image, ImageDraw, ImageFont
 
-PROFILE_FRAMES_DIR = os.path.join("data", "profile_frames")
+from config import PROFILE_CARD_FONT, PROFILE_CARD_ENCODER, PROFILE_THUMBNAIL_ENCODER
 
+from utils.avatar_cache import avatar_cache
+from utils.frame_assets import frame_assets
+from utils.image_encoder import EncodedImage, check_profile, encode, encoder_stats, extension_for
+from utils.render_cache import RenderKey, render_cache
+from utils.render_pool import render_pool
+
+RENDERER_VERSION = 2           # bump whenever the drawing code changes (invalidates cached renders)
 CARD_SIZE = (512, 512)         # default you chose
-AVATAR_SIZE = (360, 360)       # square avatar area on the full card
-AVATAR_POS = (76, 96)          # where the avatar is placed on the full card
+AVATAR_SIZE = (220, 220)       # square avatar area on the full card
+AVATAR_POS = (24, 92)          # where the avatar is placed on the full card
 HEADER_HEIGHT = 64             # top accent strip height
+CARD_BACKGROUND = (32, 34, 37, 255)
 
 def _parse_hex_color(value: Optional[str], fallback: Tuple[int, int, int] = (54, 57, 63)) -> Tuple[int, int, int]:
     """
@@ -32,62 +41,187 @@ def _parse_hex_color(value: Optional[str], fallback: Tuple[int, int, int] = (54,
     except ValueError:
         return fallback
 
-async def render_profile_card(
-    member: discord.Member,
+# Raw avatar pixels handed to a render worker: (width, height, RGBA bytes)
+AvatarPixels = Tuple[int, int, bytes]
+
+async def _avatar_pixels(member: discord.Member) -> Optional[AvatarPixels]:
+    """Cached avatar as plain bytes (safe to send to a worker thread or process)."""
+    try:
+        avatar = await avatar_cache.get(member, 512)
+    except Exception:
+        return None
+    return avatar.width, avatar.height, avatar.tobytes()
+
+def _avatar_image(avatar: Optional[AvatarPixels], size: Tuple[int, int]) -> Optional[Image.Image]:
+    if avatar is None:
+        return None
+    width, height, data = avatar
+    return Image.frombytes("RGBA", (width, height), data).resize(size, Image.Resampling.LANCZOS)
+
+def _encoder_for(kind: str, encoder: Optional[str]) -> str:
+    """Explicit encoder profile, else the configured one for this kind of image."""
+    return check_profile(encoder or (PROFILE_CARD_ENCODER if kind == "card" else PROFILE_THUMBNAIL_ENCODER))
+
+def render_key(
+    member: discord.abc.User,
+    kind: str,
+    frame_id: Optional[str],
+    accent_hex: Optional[str],
+    size: int,
+    encoder: Optional[str] = None,
+) -> RenderKey:
+    """Cache key covering every input of a render ("card" or "thumb")."""
+    accent = "#%02x%02x%02x" % _parse_hex_color(accent_hex, fallback=(88, 101, 242))
+    version = frame_assets.version(frame_id)
+    frame = frame_id if version else ""  # a missing frame renders the same as no frame
+    return (kind, member.display_avatar.key, frame, version, accent, int(size), _encoder_for(kind, encoder), RENDERER_VERSION)
+
+class CardStats(NamedTuple):
+    """Text shown on the full card (plain data so it can be sent to a render worker)."""
+    name: str
+    level: int
+    xp: int
+    needed: int
+    currency: str
+    balance: int
+    wordle_streak: int
+    connect4_streak: int
+    battleship_streak: int
+
+_LAYER_CACHE_SIZE = 64
+_layer_lock = threading.Lock()
+_static_layers: "OrderedDict[Tuple[int, int, int], Image.Image]" = OrderedDict()  # accent -> background + header
+_avatar_layers: "OrderedDict[tuple, Image.Image]" = OrderedDict()                 # avatar/frame -> framed avatar
+
+def _cached_layer(cache: OrderedDict, key, build) -> Image.Image:
+    with _layer_lock:
+        layer = cache.get(key)
+        if layer is not None:
+            cache.move_to_end(key)
+            return layer
+    layer = build()
+    with _layer_lock:
+        cache[key] = layer
+        while len(cache) > _LAYER_CACHE_SIZE:
+            cache.popitem(last=False)
+    return layer
+
+def _static_layer(accent: Tuple[int, int, int]) -> Image.Image:
+    """Background, accent header and border; identical for every card with this accent."""
+    def build():
+        base = Image.new("RGBA", CARD_SIZE, CARD_BACKGROUND)
+        draw = ImageDraw.Draw(base)
+        draw.rectangle([0, 0, CARD_SIZE[0], HEADER_HEIGHT], fill=(accent[0], accent[1], accent[2], 255))
+        draw.rectangle([0, 0, CARD_SIZE[0] - 1, CARD_SIZE[1] - 1], outline=(0, 0, 0, 120), width=2)
+        return base
+    return _cached_layer(_static_layers, accent, build)
+
+def _avatar_layer(avatar: Optional[AvatarPixels], avatar_key: Optional[str], frame_id: Optional[str]) -> Optional[Image.Image]:
+    """Avatar resized to AVATAR_SIZE with the frame composited on top."""
+    def build():
+        layer = Image.new("RGBA", AVATAR_SIZE, (0, 0, 0, 0))
+        image = _avatar_image(avatar, AVATAR_SIZE)
+        if image is not None:
+            layer.alpha_composite(image)
+        frame = frame_assets.get(frame_id, AVATAR_SIZE)
+        if frame is not None:
+            layer.alpha_composite(frame)
+        return layer
+
+    if avatar is None and not frame_id:
+        return None
+    if avatar is None or avatar_key is None:
+        return build()  # nothing stable to key a fallback on
+    return _cached_layer(_avatar_layers, (avatar_key, frame_id or "", frame_assets.version(frame_id)), build)
+
+@functools.lru_cache(maxsize=None)
+def _font(size: int) -> ImageFont.ImageFont:
+    """Fonts are opened once per size; their glyph metrics are reused by every card."""
+    if PROFILE_CARD_FONT:
+        try:
+            return ImageFont.truetype(PROFILE_CARD_FONT, size)
+        except OSError as e:
+            print(f"[Card] Could not load font '{PROFILE_CARD_FONT}', using the default: {e}")
+    return ImageFont.load_default(size)
+
+def _fit(text: str, font: ImageFont.ImageFont, width: int) -> str:
+    if font.getlength(text) <= width:
+        return text
+    while text and font.getlength(text + "…") > width:
+        text = text[:-1]
+    return text + "…"
+
+def _draw_text_layer(base: Image.Image, stats: CardStats, accent: Tuple[int, int, int]) -> None:
+    """The only per-request drawing: name, level, XP bar, balance and streaks."""
+    draw = ImageDraw.Draw(base)
+    white, muted = (255, 255, 255, 255), (185, 187, 190, 255)
+    label, value, title = _font(16), _font(28), _font(30)
+
+    draw.text((24, HEADER_HEIGHT // 2), _fit(stats.name, title, CARD_SIZE[0] - 48), font=title, fill=white, anchor="lm")
+
+    # Right column next to the avatar
+    x = AVATAR_POS[0] + AVATAR_SIZE[0] + 24
+    width = CARD_SIZE[0] - x - 24
+    y = AVATAR_POS[1]
+    rows = (("LEVEL", str(stats.level)), ("XP", f"{stats.xp} / {stats.needed}"), (stats.currency.upper(), f"{stats.balance:,}"))
+    for caption, text in rows:
+        draw.text((x, y), _fit(caption, label, width), font=label, fill=muted)
+        draw.text((x, y + 18), _fit(text, value, width), font=value, fill=white)
+        y += 72
+
+    # Level progress bar
+    top = AVATAR_POS[1] + AVATAR_SIZE[1] + 32
+    left, right = 24, CARD_SIZE[0] - 24
+    draw.rounded_rectangle([left, top, right, top + 20], radius=10, fill=(64, 68, 75, 255))
+    progress = min(1.0, stats.xp / stats.needed) if stats.needed > 0 else 0.0
+    if progress > 0:
+        fill_right = left + max(20, int((right - left) * progress))
+        draw.rounded_rectangle([left, top, fill_right, top + 20], radius=10, fill=(accent[0], accent[1], accent[2], 255))
+
+    # Streaks
+    top += 48
+    column = (right - left) // 3
+    streaks = (("Wordle", stats.wordle_streak), ("Connect4", stats.connect4_streak), ("Battleship", stats.battleship_streak))
+    for i, (caption, streak) in enumerate(streaks):
+        cx = left + column * i + column // 2
+        draw.text((cx, top), f"{caption} streak", font=label, fill=muted, anchor="mt")
+        draw.text((cx, top + 20), str(streak), font=value, fill=white, anchor="mt")
+
+def draw_profile_card(
+    avatar: Optional[AvatarPixels],
     frame_id: Optional[str] = None,
     accent_hex: Optional[str] = None,
-) -> BytesIO:
+    stats: Optional[CardStats] = None,
+    avatar_key: Optional[str] = None,
+    encoder: str = "png",
+) -> EncodedImage:
     """
-    Returns PNG bytes for a generated 512x512 profile card:
-    - solid background
-    - accent header strip
-    - user's square avatar
-    - optional PNG frame overlay from data/profile_frames/<frame_id>.png
+    Renders the 512x512 profile card (runs on the render pool) from layers:
+    - background + accent header (cached per accent color)
+    - framed avatar (cached per avatar hash / frame)
+    - text layer with the member's stats (drawn per request)
     """
-    # Base canvas
-    base = Image.new("RGBA", CARD_SIZE, (32, 34, 37, 255))
-    draw = ImageDraw.Draw(base)
-
     accent = _parse_hex_color(accent_hex, fallback=(88, 101, 242))
-    draw.rectangle([0, 0, CARD_SIZE[0], HEADER_HEIGHT], fill=(accent[0], accent[1], accent[2], 255))
+    base = _static_layer(accent).copy()
 
-    # Subtle border
-    draw.rectangle([0, 0, CARD_SIZE[0] - 1, CARD_SIZE[1] - 1], outline=(0, 0, 0, 120), width=2)
+    layer = _avatar_layer(avatar, avatar_key, frame_id)
+    if layer is not None:
+        base.alpha_composite(layer, dest=AVATAR_POS)
 
-    # Avatar (square)
-    try:
-        avatar_asset = member.display_avatar.replace(size=512, static_format="png")
-        avatar_bytes = await avatar_asset.read()
-        avatar = Image.open(BytesIO(avatar_bytes)).convert("RGBA")
-        avatar = avatar.resize(AVATAR_SIZE, Image.Resampling.LANCZOS)
-        base.alpha_composite(avatar, dest=AVATAR_POS)
-    except Exception:
-        pass
-
-    # Frame overlay (full 512x512)
-    if frame_id:
-        frame_path = os.path.join(PROFILE_FRAMES_DIR, f"{frame_id}.png")
-        if os.path.exists(frame_path):
-            try:
-                frame = Image.open(frame_path).convert("RGBA")
-                frame = frame.resize(CARD_SIZE, Image.Resampling.LANCZOS)
-                base.alpha_composite(frame, dest=(0, 0))
-            except Exception:
-                pass
-
-    out = BytesIO()
-    base.save(out, format="PNG")
-    out.seek(0)
-    return out
+    if stats is not None:
+        _draw_text_layer(base, stats, accent)
 
-async def render_profile_thumbnail(
-    member: discord.Member,
+    return encode(base, encoder)
+
+def draw_profile_thumbnail(
+    avatar: Optional[AvatarPixels],
     frame_id: Optional[str] = None,
     accent_hex: Optional[str] = None,
     size: int = 256,
-) -> BytesIO:
+    encoder: str = "png",
+) -> EncodedImage:
     """
-    Returns PNG bytes for a square thumbnail (default 256x256):
+    Renders a square thumbnail (runs on the render pool):
     - user's avatar
     - optional frame overlay (scaled from 512x512 frame PNG)
     - subtle accent border
@@ -101,27 +235,67 @@ async def render_profile_thumbnail(
     draw.rectangle([0, 0, size - 1, size - 1], outline=(accent[0], accent[1], accent[2], 255), width=border_w)
 
     # Avatar (fills the thumbnail)
-    try:
-        avatar_asset = member.display_avatar.replace(size=512, static_format="png")
-        avatar_bytes = await avatar_asset.read()
-        avatar = Image.open(BytesIO(avatar_bytes)).convert("RGBA")
-        avatar = avatar.resize((size, size), Image.Resampling.LANCZOS)
-        base.alpha_composite(avatar, dest=(0, 0))
-    except Exception:
-        pass
+    image = _avatar_image(avatar, (size, size))
+    if image is not None:
+        base.alpha_composite(image, dest=(0, 0))
 
     # Frame overlay scaled down
-    if frame_id:
-        frame_path = os.path.join(PROFILE_FRAMES_DIR, f"{frame_id}.png")
-        if os.path.exists(frame_path):
-            try:
-                frame = Image.open(frame_path).convert("RGBA")
-                frame = frame.resize((size, size), Image.Resampling.LANCZOS)
-                base.alpha_composite(frame, dest=(0, 0))
-            except Exception:
-                pass
-
-    out = BytesIO()
-    base.save(out, format="PNG")
-    out.seek(0)
-    return out
+    frame = frame_assets.get(frame_id, (size, size))
+    if frame is not None:
+        base.alpha_composite(frame, dest=(0, 0))
+
+    return encode(base, encoder)
+
+async def render_profile_card(
+    member: discord.Member,
+    frame_id: Optional[str] = None,
+    accent_hex: Optional[str] = None,
+    stats: Optional[CardStats] = None,
+    encoder: Optional[str] = None,
+) -> EncodedImage:
+    """
+    Returns the encoded 512x512 profile card, with `stats` drawn as text when
+    given (encoder profile defaults to PROFILE_CARD_ENCODER). A card without
+    text is served from the render cache when nothing changed; otherwise the
+    avatar is fetched here and all PIL work happens on the render pool.
+    Raises RenderQueueFull when too many renders are already waiting.
+    """
+    encoder = _encoder_for("card", encoder)
+    key = render_key(member, "card", frame_id, accent_hex, CARD_SIZE[0], encoder)
+    data = render_cache.get(key) if stats is None else None
+    if data is not None:
+        return EncodedImage(data, extension_for(encoder), 0.0)
+
+    avatar = await _avatar_pixels(member)
+    avatar_key = member.display_avatar.key if avatar is not None else None
+    image = await render_pool.run(draw_profile_card, avatar, frame_id, accent_hex, stats, avatar_key, encoder)
+    encoder_stats.record(encoder, image)
+    if avatar is not None and stats is None:  # don't pin an avatar-less fallback under this avatar's key
+        render_cache.put(key, image.data)
+    return image
+
+async def render_profile_thumbnail(
+    member: discord.Member,
+    frame_id: Optional[str] = None,
+    accent_hex: Optional[str] = None,
+    size: int = 256,
+    encoder: Optional[str] = None,
+) -> EncodedImage:
+    """
+    Returns an encoded square thumbnail (default 256x256, PROFILE_THUMBNAIL_ENCODER).
+    Served from the render cache when nothing changed; otherwise the avatar is
+    fetched here and all PIL work happens on the render pool.
+    Raises RenderQueueFull when too many renders are already waiting.
+    """
+    encoder = _encoder_for("thumb", encoder)
+    key = render_key(member, "thumb", frame_id, accent_hex, size, encoder)
+    data = render_cache.get(key)
+    if data is not None:
+        return EncodedImage(data, extension_for(encoder), 0.0)
+
+    avatar = await _avatar_pixels(member)
+    image = await render_pool.run(draw_profile_thumbnail, avatar, frame_id, accent_hex, size, encoder)
+    encoder_stats.record(encoder, image)
+    if avatar is not None:
+        render_cache.put(key, image.data)
+    return image
@@ -0,0 +1,157 @@
+# utils/render_cache.py
+import time
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import discord
+
+from config import PROFILE_RENDER_CACHE_MB
+
+# (kind, avatar hash, frame_id, frame version, accent "#rrggbb", size, encoder profile, renderer version)
+RenderKey = Tuple[str, str, str, int, str, int, str, int]
+
+URL_TTL_SECONDS = 12 * 60 * 60   # reuse an upload this long when Discord gives no expiry
+URL_EXPIRY_MARGIN = 60 * 60      # stop reusing a signed URL this long before it expires
+
+class _Entry:
+    __slots__ = ("data", "url", "url_expires", "message_id", "channel_id")
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self.url: Optional[str] = None
+        self.url_expires = 0.0
+        self.message_id: Optional[int] = None  # message the URL's attachment belongs to
+        self.channel_id: Optional[int] = None
+
+class RenderCache:
+    """
+    Finished (encoded) profile images keyed by everything that affects the pixels.
+
+    The key includes the avatar hash, frame id + file version, accent color,
+    size, encoder profile and renderer version, so equipping another
+    frame/color, changing avatar or editing a frame PNG simply produces a new
+    key and the old entry ages out of the byte-budgeted LRU. Each entry also
+    remembers the Discord CDN URL of its last upload, letting a repeat view
+    point at that attachment instead of uploading the same image again.
+
+    An attachment URL dies with its message, so the URL is dropped when the
+    upload's message or channel is deleted (see forget_message/forget_channel,
+    called from cogs/profile.py). Deletions while the bot is offline can't be
+    seen; the URL cache is memory-only, so a restart starts clean anyway.
+    """
+
+    def __init__(self, max_bytes: int = PROFILE_RENDER_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max(0, int(max_bytes))
+        self._entries: "OrderedDict[RenderKey, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0        # bytes served without rendering
+        self.url_hits = 0    # views that reused an uploaded attachment
+        self.misses = 0
+
+    def get(self, key: RenderKey) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.data
+
+    def put(self, key: RenderKey, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old.data)
+            self._entries[key] = _Entry(data)
+            self._bytes += len(data)
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted.data)
+
+    def url(self, key: RenderKey) -> Optional[str]:
+        """CDN URL of the last upload of this image, if it is still safe to reuse."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.url is None:
+                return None
+            if time.time() >= entry.url_expires:
+                entry.url = None
+                return None
+            self._entries.move_to_end(key)
+            self.url_hits += 1
+            return entry.url
+
+    def remember_upload(self, key: RenderKey, message: Optional[discord.Message]) -> None:
+        """Remembers the URL of the image uploaded with `message` for later views."""
+        url = uploaded_url(message)
+        if not url:
+            return
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.url = url
+                entry.url_expires = _url_expiry(url)
+                entry.message_id = message.id
+                entry.channel_id = message.channel.id
+
+    def _forget(self, match) -> int:
+        # The image bytes stay cached; only the dead URL goes
+        forgotten = 0
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.url is not None and match(entry):
+                    entry.url = entry.message_id = entry.channel_id = None
+                    forgotten += 1
+        return forgotten
+
+    def forget_message(self, message_id: int) -> int:
+        """Drops URLs uploaded with a deleted message. Returns how many were dropped."""
+        return self._forget(lambda entry: entry.message_id == message_id)
+
+    def forget_channel(self, channel_id: int) -> int:
+        """Drops URLs uploaded in a deleted channel. Returns how many were dropped."""
+        return self._forget(lambda entry: entry.channel_id == channel_id)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "url_hits": self.url_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "memory_bytes": self._bytes,
+            }
+
+def _url_expiry(url: str) -> float:
+    # Discord signs attachment URLs with ?ex=<hex unix time>
+    now = time.time()
+    try:
+        ex = parse_qs(urlsplit(url).query).get("ex")
+        if ex:
+            return int(ex[0], 16) - URL_EXPIRY_MARGIN
+    except ValueError:
+        pass
+    return now + URL_TTL_SECONDS
+
+def uploaded_url(message: Optional[discord.Message]) -> Optional[str]:
+    """URL Discord assigned to the image uploaded with `message` (embed thumbnail or first attachment)."""
+    if message is None:
+        return None
+    urls: List[Optional[str]] = []
+    for embed in message.embeds:
+        urls.append(embed.thumbnail.url)
+        urls.append(embed.image.url)
+    urls.extend(a.url for a in message.attachments)
+    for url in urls:
+        if url and not url.startswith("attachment://"):
+            return url
+    return None
+
+
+render_cache = RenderCache()
@@ -0,0 +1,106 @@
+# utils/render_pool.py
+import time
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+from config import PROFILE_RENDER_MODE, PROFILE_RENDER_WORKERS, PROFILE_RENDER_QUEUE
+
+class RenderQueueFull(Exception):
+    """Raised when PROFILE_RENDER_QUEUE renders are already waiting for a worker."""
+
+class RenderPool:
+    """
+    Bounded pool for CPU-heavy image work, so PIL never runs on the event loop.
+
+    At most `workers` renders run at once; up to `max_queue` more wait for a slot
+    and anything beyond that is refused with RenderQueueFull (backpressure instead
+    of an ever-growing backlog). Functions must be module-level and take only
+    plain data (bytes, str, int, tuples) so they also work with processes.
+    """
+
+    def __init__(self, workers: int = PROFILE_RENDER_WORKERS, mode: str = PROFILE_RENDER_MODE, max_queue: int = PROFILE_RENDER_QUEUE):
+        self.workers = max(1, int(workers))
+        self.mode = (mode or "thread").lower()
+        if self.mode not in ("thread", "process"):
+            raise ValueError(f"Unknown PROFILE_RENDER_MODE '{mode}' (expected 'thread' or 'process')")
+        self.max_queue = max(0, int(max_queue))
+
+        self._executor: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._waiting = 0
+        self._running = 0
+        self._latencies = deque(maxlen=500)  # seconds from submit to result
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                # Spawned workers start from a clean interpreter instead of forking the
+                # running bot (its event loop, sockets and threads' held locks)
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+        return self._executor
+
+    async def run(self, func, *args):
+        """Runs func(*args) on a worker and returns its result."""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        if self._slots.locked() and self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise RenderQueueFull()
+
+        started = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), func, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self._running -= 1
+            self._slots.release()
+
+        self._latencies.append(time.perf_counter() - started)
+        self.completed += 1
+        return result
+
+    def stats(self) -> dict:
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))] * 1000, 1)
+
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "running": self._running,
+            "queue_depth": self._waiting,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "p50_ms": pct(0.50),
+            "p95_ms": pct(0.95),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+render_pool = RenderPool()
@@ -1,27 +1,14 @@
 from typing import Optional, List, Tuple
-from utils.economy import load_economy, save_economy, EconomyIdentity
+from utils.economy import load_economy, transaction, withdraw, EconomyIdentity
+from utils.economy_record import EconomyRecord
 
-def ensure_shop_schema(identity: EconomyIdentity) -> dict:
+def ensure_shop_schema(identity: EconomyIdentity) -> EconomyRecord:
     """
-    Adds/repairs shop inventory fields inside the user's economy JSON.
-    Safe to call any time.
+    Returns the user's economy record with shop inventory fields present.
+    Pure read: the inventory layout is created by the economy schema migration
+    (utils.economy, v0 -> v1) the first time a record is loaded.
     """
-    data = load_economy(identity)
-
-    inv = data.setdefault("inventory", {})
-
-    # Equipped cosmetics
-    profile = inv.setdefault("profile", {})
-    profile.setdefault("frame", None)         # equipped frame_id (str) or None
-    profile.setdefault("accent_color", None)  # equipped color hex "#RRGGBB" or None
-
-    # Owned cosmetics
-    owned = inv.setdefault("owned", {})
-    owned.setdefault("frames", [])            # list[str]
-    owned.setdefault("colors", [])            # list[str] (hex "#RRGGBB")
-
-    save_economy(data["user_id"], data)
-    return data
+    return load_economy(identity)
 
 # ---------- Read helpers ----------
 
@@ -50,35 +37,52 @@ def grant_frame(identity: EconomyIdentity, frame_id: str) -> bool:
     """
     Adds a frame to owned frames. Returns True if newly added, False if already owned.
     """
-    data = ensure_shop_schema(identity)
-    frames = data["inventory"]["owned"]["frames"]
-    if frame_id in frames:
-        return False
-    frames.append(frame_id)
-    save_economy(data["user_id"], data)
-    return True
+    with transaction(identity, write_through=False) as (data,):
+        frames = data["inventory"]["owned"]["frames"]
+        if frame_id in frames:
+            return False
+        frames.append(frame_id)
+        data.mark_dirty("inventory")
+        return True
 
 def grant_color(identity: EconomyIdentity, color_hex: str) -> bool:
     """
     Adds a color to owned colors. Returns True if newly added, False if already owned.
     """
-    data = ensure_shop_schema(identity)
-    colors = data["inventory"]["owned"]["colors"]
-    if color_hex in colors:
-        return False
-    colors.append(color_hex)
-    save_economy(data["user_id"], data)
-    return True
+    with transaction(identity, write_through=False) as (data,):
+        colors = data["inventory"]["owned"]["colors"]
+        if color_hex in colors:
+            return False
+        colors.append(color_hex)
+        data.mark_dirty("inventory")
+        return True
+
+def purchase(identity: EconomyIdentity, kind: str, item: str, price: int) -> Optional[int]:
+    """
+    Buys a frame or color in one transaction: ownership check, payment and
+    grant all commit together (or not at all), so two concurrent purchases
+    can't both pass the balance check.
+    kind is "frames" or "colors". Returns the new balance, or None if the item
+    was already owned. Raises InsufficientFunds if the member can't afford it.
+    """
+    with transaction(identity) as (data,):
+        owned = data["inventory"]["owned"][kind]
+        if item in owned:
+            return None
+        balance = withdraw(data, price)
+        owned.append(item)
+        data.mark_dirty("inventory")
+        return balance
 
 def equip_frame(identity: EconomyIdentity, frame_id: Optional[str]) -> None:
-    data = ensure_shop_schema(identity)
-    data["inventory"]["profile"]["frame"] = frame_id
-    save_economy(data["user_id"], data)
+    with transaction(identity, write_through=False) as (data,):
+        data["inventory"]["profile"]["frame"] = frame_id
+        data.mark_dirty("inventory")
 
 def equip_color(identity: EconomyIdentity, color_hex: Optional[str]) -> None:
-    data = ensure_shop_schema(identity)
-    data["inventory"]["profile"]["accent_color"] = color_hex
-    save_economy(data["user_id"], data)
+    with transaction(identity, write_through=False) as (data,):
+        data["inventory"]["profile"]["accent_color"] = color_hex
+        data.mark_dirty("inventory")
 
 # ---------- Validation helpers ----------
 
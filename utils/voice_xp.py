@@ -0,0 +1,95 @@
+# utils/voice_xp.py
+import time
+from typing import Dict, List, Optional, Tuple
+
+import discord
+import config
+
+class VoiceSessions:
+    """
+    Tracks when each member is earning voice XP, purely from voice state events.
+
+    A member earns while they sit in a voice channel that is not the server's AFK
+    channel, are not muted/deafened (unless VOICE_XP_ALLOW_MUTED) and share the
+    channel with at least VOICE_XP_MIN_MEMBERS - 1 other earning-eligible humans.
+    Eligible time is banked in seconds and only converted to XP when collect()
+    is called (session end or a checkpoint), so nothing polls per minute.
+    """
+
+    def __init__(self):
+        self._since: Dict[int, Tuple[float, discord.Member, int]] = {}  # member_id -> (started, member, channel_id)
+        self._banked: Dict[int, float] = {}                             # member_id -> eligible seconds not yet paid
+        self._members: Dict[int, discord.Member] = {}                   # latest Member object per tracked id
+
+    # ---------- Eligibility ----------
+
+    @staticmethod
+    def _present(member: discord.Member) -> bool:
+        voice = member.voice
+        if member.bot or voice is None or voice.channel is None:
+            return False
+        if member.guild.afk_channel is not None and voice.channel.id == member.guild.afk_channel.id:
+            return False
+        if not config.VOICE_XP_ALLOW_MUTED and (voice.self_mute or voice.self_deaf or voice.mute or voice.deaf):
+            return False
+        return True
+
+    def refresh(self, channel, now: Optional[float] = None) -> None:
+        """Re-evaluates everyone in `channel` (call for both channels of a voice update)."""
+        now = time.monotonic() if now is None else now
+        present = [m for m in channel.members if self._present(m)]
+        earning = len(present) >= max(1, int(config.VOICE_XP_MIN_MEMBERS))
+        earning_ids = {m.id for m in present} if earning else set()
+
+        # Stop anyone tracked in this channel who left it or no longer qualifies
+        for member_id, (_, _, channel_id) in list(self._since.items()):
+            if channel_id == channel.id and member_id not in earning_ids:
+                self._stop(member_id, now)
+
+        for member in present if earning else ():
+            tracked = self._since.get(member.id)
+            if tracked is not None and tracked[2] != channel.id:
+                self._stop(member.id, now)  # moved here straight from another channel
+                tracked = None
+            if tracked is None:
+                self._since[member.id] = (now, member, channel.id)
+            self._members[member.id] = member
+
+    def _stop(self, member_id: int, now: float) -> None:
+        started, _, _ = self._since.pop(member_id)
+        self._banked[member_id] = self._banked.get(member_id, 0.0) + max(0.0, now - started)
+
+    def is_earning(self, member_id: int) -> bool:
+        return member_id in self._since
+
+    # ---------- Payout ----------
+
+    def collect(self, member_id: Optional[int] = None, now: Optional[float] = None) -> List[Tuple[discord.Member, int]]:
+        """
+        Converts banked (and, for ongoing sessions, elapsed) time into whole
+        minutes: [(member, minutes)]. A partial minute carries over while the
+        member is still earning.
+        """
+        now = time.monotonic() if now is None else now
+        ids = [member_id] if member_id is not None else list(set(self._since) | set(self._banked))
+
+        out = []
+        for mid in ids:
+            seconds = self._banked.pop(mid, 0.0)
+            tracked = self._since.get(mid)
+            if tracked is not None:
+                started, member, channel_id = tracked
+                seconds += max(0.0, now - started)
+                self._since[mid] = (now, member, channel_id)  # checkpoint: restart the interval
+
+            minutes, rest = divmod(seconds, 60)
+            member = self._members.get(mid)
+            if tracked is not None:
+                if rest:
+                    self._banked[mid] = rest  # partial minute carries into the running session
+            else:
+                self._members.pop(mid, None)  # session over; a partial minute is dropped
+
+            if minutes and member is not None:
+                out.append((member, int(minutes)))
+        return out
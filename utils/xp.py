@@ -1,21 +1,22 @@
 # utils/xp.py
-import time
-from utils.economy import load_economy, add_xp
+import atexit
+import threading
+from typing import Dict, List, Optional, Tuple
 
-def get_xp_multiplier(key: str) -> float:
-    """
-    Returns active XP multiplier based on xp_bonus.
-    """
-    data = load_economy(key)
-    bonus = data.get("xp_bonus", {}) or {}
+from config import XP_FLUSH_MAX_EVENTS
+from utils.economy import load_economy, add_xp, run_io, user_key
+from utils.period_stats import period_stats
+from utils.xp_boosts import boosts
+from utils.xp_curve import curve
 
-    mult = float(bonus.get("multiplier", 1.0) or 1.0)
-    expires = int(bonus.get("expires_at", 0) or 0)
+def _key(identity) -> str:
+    return identity if isinstance(identity, str) else user_key(identity)
 
-    if mult > 1.0 and int(time.time()) < expires:
-        return mult
-
-    return 1.0
+def get_xp_multiplier(key) -> float:
+    """
+    Returns the active XP multiplier (user or server-wide boost, see utils.xp_boosts).
+    """
+    return boosts.multiplier(_key(key))
 
 
 def award_xp(key: str, base_amount: int):
@@ -25,5 +26,99 @@ def award_xp(key: str, base_amount: int):
     mult = get_xp_multiplier(key)
     awarded = int(round(base_amount * mult))
 
-    leveled, level = add_xp(key, awarded)
+    leveled, level, _ = add_xp(key, awarded)
+    period_stats.record(_key(key), xp=awarded)
     return leveled, level, awarded
+
+
+async def aaward_xp(key, base_amount: int):
+    """
+    Async award_xp(): runs the economy update on the economy I/O pool.
+    """
+    return await run_io(award_xp, key, base_amount)
+
+
+# (member, new_level, currency reward paid, context passed to XPBuffer.add) for each level-up applied
+LevelUp = Tuple[object, int, int, object]
+
+class XPBuffer:
+    """
+    Collects XP per member in memory and applies it to the economy in batches:
+    on flush() (timer in cogs/xp.py), once XP_FLUSH_MAX_EVENTS events are
+    buffered, or right away for a member whose pending XP reaches the next level
+    so level-ups are still announced immediately.
+    """
+
+    def __init__(self, max_events: int = XP_FLUSH_MAX_EVENTS):
+        self.max_events = max(1, int(max_events))
+        self._lock = threading.Lock()
+        self._pending: Dict[str, int] = {}
+        self._members: Dict[str, object] = {}   # latest Member/User, so labels still refresh
+        self._contexts: Dict[str, object] = {}  # e.g. the channel to announce a level-up in
+        self._events = 0
+
+    def pending_xp(self, identity) -> int:
+        """XP earned but not yet written to the member's economy record."""
+        with self._lock:
+            return self._pending.get(_key(identity), 0)
+
+    def add(self, identity, base_amount: int, context: object = None) -> List[LevelUp]:
+        """
+        Buffers `base_amount` XP (multiplier applied now). Blocking (may load the
+        record): run on the economy I/O pool. Returns any level-ups applied.
+        """
+        key = _key(identity)
+        # Loaded first so pending migrations (an old xp_bonus -> boost table) count for this award
+        data = load_economy(identity)
+        awarded = int(round(base_amount * get_xp_multiplier(key)))
+        if awarded <= 0:
+            return []
+
+        with self._lock:
+            pending = self._pending.get(key, 0) + awarded
+            self._pending[key] = pending
+            self._members[key] = identity
+            if context is not None:
+                self._contexts[key] = context
+            self._events += 1
+            full = self._events >= self.max_events
+
+        if full:
+            return self.flush()
+
+        if pending >= curve.to_next(int(data.get("level", 1) or 1), int(data.get("xp", 0) or 0)):
+            return self.flush([key])
+        return []
+
+    def flush(self, keys: Optional[List[str]] = None) -> List[LevelUp]:
+        """Applies buffered XP (all members, or just `keys`). Returns the level-ups."""
+        with self._lock:
+            if keys is None:
+                keys = list(self._pending)
+                self._events = 0
+            batch = [
+                (key, self._pending.pop(key), self._members.pop(key, key), self._contexts.pop(key, None))
+                for key in keys if key in self._pending
+            ]
+
+        level_ups = []
+        for key, amount, identity, context in batch:
+            try:
+                leveled, level, reward = add_xp(identity, amount)
+            except Exception as e:
+                print(f"[XP] Failed to apply {amount} buffered XP for {key}: {e}")
+                with self._lock:
+                    self._pending[key] = self._pending.get(key, 0) + amount
+                continue
+
+            period_stats.record(key, xp=amount)
+            if leveled:
+                level_ups.append((identity, level, reward, context))
+        return level_ups
+
+
+xp_buffer = XPBuffer()
+atexit.register(xp_buffer.flush)
+
+def pending_xp(identity) -> int:
+    return xp_buffer.pending_xp(identity)
@@ -0,0 +1,137 @@
+# utils/xp_boosts.py
+import os
+import json
+import time
+import heapq
+import atexit
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from config import ECONOMY_FLUSH_INTERVAL
+
+XP_BOOSTS_FILE = os.path.join("data", "xp_boosts.json")
+
+SERVER = "server"  # table key of the server-wide boost
+
+# (multiplier, expires_at unix seconds)
+Boost = Tuple[float, float]
+
+class BoostTable:
+    """
+    Active XP multipliers by user ID (plus one server-wide entry), kept in memory
+    so award lookups are a dict read. A min-heap of expiry times lets a background
+    thread drop boosts as they run out; the table is saved to XP_BOOSTS_FILE
+    whenever it changes. A member earns the larger of their own and the
+    server-wide multiplier.
+    """
+
+    def __init__(self, path: str = XP_BOOSTS_FILE):
+        self.path = path
+        self._cond = threading.Condition()
+        self._boosts: Dict[str, Boost] = {}
+        self._heap: List[Tuple[float, str]] = []  # (expires_at, key); stale entries are skipped
+        self._dirty = False
+        self._load()
+
+    # ---------- Persistence ----------
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                raw = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        now = time.time()
+        for key, (mult, expires_at) in raw.items():
+            if expires_at > now:
+                self._boosts[key] = (float(mult), float(expires_at))
+                heapq.heappush(self._heap, (float(expires_at), key))
+
+    def save(self) -> None:
+        with self._cond:
+            if not self._dirty:
+                return
+            snapshot = {key: list(boost) for key, boost in self._boosts.items()}
+            self._dirty = False
+
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, indent=4)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            with self._cond:
+                self._dirty = True
+            print(f"[XP] Failed to save XP boosts: {e}")
+
+    # ---------- Grants ----------
+
+    def grant(self, key: str, multiplier: float, duration: float) -> Boost:
+        """Sets (replaces) the boost for `key` (a user ID or SERVER) for `duration` seconds."""
+        boost = (float(multiplier), time.time() + float(duration))
+        with self._cond:
+            self._boosts[key] = boost
+            heapq.heappush(self._heap, (boost[1], key))
+            self._dirty = True
+            self._cond.notify()
+        return boost
+
+    def revoke(self, key: str) -> bool:
+        with self._cond:
+            if self._boosts.pop(key, None) is None:
+                return False
+            self._dirty = True
+            self._cond.notify()
+            return True
+
+    # ---------- Lookups ----------
+
+    def _active(self, key: str, now: float) -> float:
+        boost = self._boosts.get(key)
+        if boost is None or boost[1] <= now:
+            return 1.0
+        return boost[0]
+
+    def multiplier(self, key: str) -> float:
+        """O(1): the member's effective XP multiplier right now."""
+        now = time.time()
+        return max(1.0, self._active(key, now), self._active(SERVER, now))
+
+    def get(self, key: str) -> Optional[Boost]:
+        boost = self._boosts.get(key)
+        if boost is None or boost[1] <= time.time():
+            return None
+        return boost
+
+    def active(self) -> Dict[str, Boost]:
+        now = time.time()
+        with self._cond:
+            return {key: boost for key, boost in self._boosts.items() if boost[1] > now}
+
+    # ---------- Expiry ----------
+
+    def _drop_expired(self, now: float) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            boost = self._boosts.get(key)
+            # Skip heap entries of boosts that were replaced or revoked since
+            if boost is not None and boost[1] == expires_at:
+                del self._boosts[key]
+                self._dirty = True
+
+    def run_expiry(self) -> None:
+        """Background loop: sleeps until the next expiry (or a grant), drops, saves."""
+        while True:
+            with self._cond:
+                self._drop_expired(time.time())
+                timeout = ECONOMY_FLUSH_INTERVAL
+                if self._heap:
+                    timeout = min(timeout, max(0.0, self._heap[0][0] - time.time()))
+                if not self._dirty:
+                    self._cond.wait(timeout)
+            self.save()
+
+
+boosts = BoostTable()
+atexit.register(boosts.save)
+threading.Thread(target=boosts.run_expiry, name="xp-boost-expiry", daemon=True).start()
@@ -0,0 +1,88 @@
+# utils/xp_curve.py
+import threading
+from bisect import bisect_right
+from typing import List, Sequence, Tuple
+
+from config import XP_CURVE, XP_CURVE_BASE, XP_CURVE_TABLE, LEVEL_UP_REWARD_MULTIPLIER
+
+class XPCurve:
+    """
+    XP needed per level plus precomputed cumulative thresholds.
+
+    A record stores `level` and `xp` (progress into that level). Applying an
+    award converts that to total XP, finds the new level with one bisect over the
+    thresholds and converts back, however many levels it spans.
+
+    kinds:
+        linear     level L -> L+1 costs base * L          (the original 100 * level)
+        quadratic  level L -> L+1 costs base * L * L
+        table      costs[L - 1]; the last entry repeats for higher levels
+    """
+
+    def __init__(self, kind: str = "linear", base: int = 100, table: Sequence[int] = ()):
+        self.kind = (kind or "linear").lower()
+        self.base = max(1, int(base))
+        self.table = [max(1, int(c)) for c in table]
+
+        if self.kind not in ("linear", "quadratic", "table"):
+            raise ValueError(f"Unknown XP_CURVE '{kind}' (expected 'linear', 'quadratic' or 'table')")
+        if self.kind == "table" and not self.table:
+            raise ValueError("XP_CURVE = 'table' needs at least one entry in XP_CURVE_TABLE")
+
+        # _thresholds[i] = total XP at which level i + 1 is reached (level 1 at 0)
+        self._thresholds: List[int] = [0]
+        self._lock = threading.Lock()
+        self._extend(1000)
+
+    def cost(self, level: int) -> int:
+        """XP needed to go from `level` to `level + 1`."""
+        level = max(1, int(level))
+        if self.kind == "linear":
+            return self.base * level
+        if self.kind == "quadratic":
+            return self.base * level * level
+        return self.table[min(level, len(self.table)) - 1]
+
+    def _extend(self, levels: int) -> None:
+        with self._lock:
+            thresholds = self._thresholds
+            while len(thresholds) < levels:
+                thresholds.append(thresholds[-1] + self.cost(len(thresholds)))
+
+    def threshold(self, level: int) -> int:
+        """Total XP at which `level` is reached."""
+        level = max(1, int(level))
+        if level > len(self._thresholds):
+            self._extend(level * 2)
+        return self._thresholds[level - 1]
+
+    def level_for(self, total_xp: int) -> int:
+        """Level reached with `total_xp` (O(log n))."""
+        while total_xp >= self._thresholds[-1]:
+            self._extend(len(self._thresholds) * 2)
+        return bisect_right(self._thresholds, total_xp)
+
+    def apply(self, level: int, xp: int, amount: int) -> Tuple[int, int]:
+        """(level, xp into level) after adding `amount` XP."""
+        total = self.threshold(level) + int(xp) + int(amount)
+        # Levels are never lost, a negative award just lowers progress
+        new_level = max(int(level), self.level_for(max(0, total)))
+        return new_level, total - self.threshold(new_level)
+
+    def to_next(self, level: int, xp: int = 0) -> int:
+        """XP still missing until the next level."""
+        return self.cost(level) - int(xp)
+
+
+def level_up_reward(old_level: int, new_level: int, multiplier: float = LEVEL_UP_REWARD_MULTIPLIER) -> int:
+    """
+    Currency for reaching every level in (old_level, new_level]: multiplier * L
+    each, summed in closed form.
+    """
+    if new_level <= old_level:
+        return 0
+    levels_sum = (new_level * (new_level + 1) - old_level * (old_level + 1)) // 2
+    return int(multiplier * levels_sum)
+
+
+curve = XPCurve(XP_CURVE, XP_CURVE_BASE, XP_CURVE_TABLE)